@@ -1,70 +1,85 @@
 from datetime import datetime
+from money import apply_rate, rate_fraction, to_cents, to_dollars
 
-def calculate_deductions(gross_pay, employee, days_worked):
-    """Calculate all deductions for an employee's paycheck"""
-    deductions = {}
-    pre_tax_total = 0.0
-    
-    # Calculate pre-tax deductions first
-    # Union additions
-    for addition in employee['union']['additions']:
-        name = addition['name']
-        if addition['type'] == 'fixed':
-            amount = addition['amount']
-        elif addition['type'] == 'per-day':
-            amount = addition['amount'] * days_worked
-        elif addition['type'] == 'percentage':
-            amount = gross_pay * addition['rate']
-        else:
-            # Default to fixed amount if type is unknown
-            amount = addition.get('amount', 0)
-        deductions[name] = amount
-        
-    # Union deductions
-    for deduction in employee['union']['deductions']:
-        name = deduction['name']
-        if deduction['type'] == 'fixed':
-            amount = deduction['amount']
-        elif deduction['type'] == 'per-day':
-            amount = deduction['amount'] * days_worked
-        elif deduction['type'] == 'percentage':
-            amount = gross_pay * deduction['rate']
+# Deduction term kinds used by compiled plans
+FIXED = 0
+PER_DAY = 1
+PERCENTAGE = 2
+
+def _compile_terms(rules):
+    """Turn a list of deduction rules into (name, kind, value) terms
+
+    Fixed and per-day values are whole cents, percentage values are exact
+    (numerator, denominator) rates.
+    """
+    terms = []
+    for rule in rules:
+        if rule['type'] == 'fixed':
+            terms.append((rule['name'], FIXED, to_cents(rule['amount'])))
+        elif rule['type'] == 'per-day':
+            terms.append((rule['name'], PER_DAY, to_cents(rule['amount'])))
+        elif rule['type'] == 'percentage':
+            terms.append((rule['name'], PERCENTAGE, rate_fraction(rule['rate'])))
         else:
             # Default to fixed amount if type is unknown
-            amount = deduction.get('amount', 0)
-        deductions[name] = amount
-        pre_tax_total += amount
+            terms.append((rule['name'], FIXED, to_cents(rule.get('amount', 0))))
+    return tuple(terms)
+
+def compile_deduction_plan(employee):
+    """ Compile an employee's deduction rules into an evaluation plan
+        Consumes: dict (employee)
+        Returns: tuple (additions, pre-tax terms, post-tax terms)
+
+        Additions and pre-tax terms are based on gross pay, post-tax terms
+        on adjusted gross. Only pre-tax terms reduce adjusted gross.
+        The plan works in cents, see calculate_deductions_cents.
+    """
+    return (
+        _compile_terms(employee['union']['additions']),
+        _compile_terms(employee['union']['deductions']) +
+        _compile_terms(employee['special_deductions']),
+        _compile_terms(employee['payroll_deductions'])
+    )
 
-    # Special deductions
-    for deduction in employee['special_deductions']:
-        name = deduction['name']
-        if deduction['type'] == 'fixed':
-            amount = deduction['amount']
-        elif deduction['type'] == 'per-day':
-            amount = deduction['amount'] * days_worked
-        elif deduction['type'] == 'percentage':
-            amount = gross_pay * deduction['rate']
+def _evaluate_terms(terms, base, days_worked, deductions):
+    """Evaluate plan terms into deductions and return their total"""
+    total = 0
+    for name, kind, value in terms:
+        if kind == PERCENTAGE:
+            # Percentages are rounded half up to the cent per line item
+            amount = apply_rate(base, value)
+        elif kind == PER_DAY:
+            amount = value * days_worked
         else:
-            # Default to fixed amount if type is unknown
-            amount = deduction.get('amount', 0)
+            amount = value
         deductions[name] = amount
-        pre_tax_total += amount
+        total += amount
+    return total
+
+def evaluate_deduction_plan(plan, gross_cents, days_worked):
+    """Calculate all deductions in cents from a compiled plan"""
+    additions, pre_tax_terms, post_tax_terms = plan
+    deductions = {}
+
+    # Calculate pre-tax deductions first
+    _evaluate_terms(additions, gross_cents, days_worked, deductions)
+    pre_tax_total = _evaluate_terms(pre_tax_terms, gross_cents, days_worked, deductions)
 
     # Calculate adjusted gross pay
-    adj_gross = gross_pay - pre_tax_total
+    adj_gross = gross_cents - pre_tax_total
 
     # Calculate post-tax deductions
-    for deduction in employee['payroll_deductions']:
-        name = deduction['name']
-        if deduction['type'] == 'fixed':
-            amount = deduction['amount']
-        elif deduction['type'] == 'per-day':
-            amount = deduction['amount'] * days_worked
-        elif deduction['type'] == 'percentage':
-            amount = adj_gross * deduction['rate']
-        else:
-            # Default to fixed amount if type is unknown
-            amount = deduction.get('amount', 0)
-        deductions[name] = amount
+    _evaluate_terms(post_tax_terms, adj_gross, days_worked, deductions)
+
+    return deductions
 
-    return deductions 
\ No newline at end of file
+def calculate_deductions_cents(gross_cents, employee, days_worked, plan=None):
+    """Calculate all deductions in cents for an employee's paycheck"""
+    if plan is None:
+        plan = compile_deduction_plan(employee)
+    return evaluate_deduction_plan(plan, gross_cents, days_worked)
+
+def calculate_deductions(gross_pay, employee, days_worked, plan=None):
+    """Calculate all deductions for an employee's paycheck"""
+    deductions = calculate_deductions_cents(to_cents(gross_pay), employee, days_worked, plan)
+    return {name: to_dollars(cents) for name, cents in deductions.items()}
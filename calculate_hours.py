@@ -1,17 +1,18 @@
 # IMPORTS
-from datetime import datetime
+from time_parsing import parse_clock_seconds
+from record_types import Timesheet, TimesheetEntry, parse_timesheet
 
 def calculate_hours(time_in, time_out):
     """
     Calculate hours worked from time in and time out.
     Returns a dictionary with the formatted times and total hours.
     """
-    # Convert time strings to datetime objects
-    time_in_dt = datetime.strptime(time_in, "%H:%M:%S")
-    time_out_dt = datetime.strptime(time_out, "%H:%M:%S")
+    # Convert time strings to seconds since midnight
+    time_in_seconds = parse_clock_seconds(time_in)
+    time_out_seconds = parse_clock_seconds(time_out)
 
     # Calculate hours worked
-    hours = (time_out_dt - time_in_dt).total_seconds() / 3600
+    hours = (time_out_seconds - time_in_seconds) / 3600
 
     return {
         'in': time_in,
@@ -19,6 +20,129 @@ def calculate_hours(time_in, time_out):
         'hours': hours
     }
 
+def empty_weekly_hours():
+    """Get zeroed weekly hours keyed by wage category"""
+    return {
+        'Regular': 0.0,
+        'Regular OT': 0.0,
+        'Holiday': 0.0,
+        'Holiday OT': 0.0,
+        'Vacation': 0.0,
+        'Sick': 0.0,
+        'Differential': 0.0
+    }
+
+def add_daily_hours(hours, entry):
+    """
+    Add one day's timesheet entry to running weekly hours.
+    The Regular/OT split depends on the Regular hours already accumulated,
+    so days must be added in timesheet order. The entry is a parsed
+    TimesheetEntry.
+    """
+    # Skip if no time in/out
+    if not entry.is_worked():
+        return
+
+    # Clock times as minutes since midnight
+    time_in, time_out = entry.clock_minutes()
+    vacation_hours, sick_hours = entry.leave_hours()
+    is_holiday = entry.holiday()
+
+    # Calculate daily hours from time in/out
+    daily_hours = (time_out - time_in) / 60
+    
+    # Add vacation and sick hours
+    hours['Vacation'] += vacation_hours
+    hours['Sick'] += sick_hours
+    
+    # Calculate regular vs OT hours
+    if is_holiday:
+        if daily_hours <= 7:
+            hours['Holiday'] += daily_hours
+        else:
+            hours['Holiday'] += 7
+            hours['Holiday OT'] += daily_hours - 7
+    else:
+        current_regular = hours['Regular']
+        if current_regular < 37.5:
+            if current_regular + daily_hours <= 37.5:
+                hours['Regular'] += daily_hours
+            else:
+                hours['Regular'] += (37.5 - current_regular)
+                hours['Regular OT'] += (current_regular + daily_hours - 37.5)
+        else:
+            hours['Regular OT'] += daily_hours
+
+    # Calculate differential (night hours)
+    if time_in >= 17 * 60 or time_out < 7 * 60:
+        hours['Differential'] += daily_hours
+
+def calculate_weekly_hours(timesheet):
+    """
+    Calculate the weekly hours by pay category from a Timesheet, or a
+    timesheet dict which is parsed first.
+    Returns a dictionary keyed by wage category.
+    """
+    hours = empty_weekly_hours()
+    for entry in parse_timesheet(timesheet).entries:
+        add_daily_hours(hours, entry)
+    return hours
+
+class IncrementalWeeklyHours:
+    """
+    Weekly hours that are kept up to date as single days are edited.
+    The running totals after each day are stored, so changing a day only
+    re-adds that day and the days after it. Results are identical to
+    calculate_weekly_hours for the same entries.
+    """
+    def __init__(self, timesheet):
+        self.days = list(timesheet['entries'].keys())
+        self.entries = dict(timesheet['entries'])
+        # Entries are parsed once, when they are set, not on each recount
+        self.parsed = {day: TimesheetEntry.from_dict(entry) for day, entry in self.entries.items()}
+        # prefix_totals[i] holds the weekly hours after adding days[:i + 1]
+        self.prefix_totals = []
+
+    def update_day(self, day, entry):
+        """Replace one day's entry, invalidating the totals from that day on"""
+        if day not in self.entries:
+            self.days.append(day)
+        self.entries[day] = entry
+        self.parsed[day] = TimesheetEntry.from_dict(entry)
+        index = self.days.index(day)
+        del self.prefix_totals[index:]
+
+    def get_hours(self):
+        """
+        Get the weekly hours, recalculating only the days after the last
+        valid running total. Raises ValueError for invalid entries.
+        """
+        while len(self.prefix_totals) < len(self.days):
+            if self.prefix_totals:
+                hours = dict(self.prefix_totals[-1])
+            else:
+                hours = empty_weekly_hours()
+            add_daily_hours(hours, self.parsed[self.days[len(self.prefix_totals)]])
+            self.prefix_totals.append(hours)
+        if self.prefix_totals:
+            return dict(self.prefix_totals[-1])
+        return empty_weekly_hours()
+
+    def get_timesheet(self, week_end):
+        """Get the current entries as a timesheet dict"""
+        return {
+            'week_end': week_end,
+            'entries': {day: self.entries[day] for day in self.days}
+        }
+
+    def get_parsed_timesheet(self, week_end):
+        """Get the current entries as a Timesheet, without parsing them again"""
+        return Timesheet(week_end, tuple(self.days), tuple(self.parsed[day] for day in self.days))
+
+def count_days_worked(timesheet):
+    """Count the days with both a time in and a time out"""
+    return parse_timesheet(timesheet).count_days_worked()
+
 def round_minutes_to_quarter_hour(minute):
     
     adjust_hour = False
@@ -0,0 +1,115 @@
+from calculate_hours import calculate_weekly_hours, count_days_worked
+from calculate_wages import WAGE_CATEGORIES, calculate_wages_cents
+from calculate_deductions import calculate_deductions_cents
+from money import to_dollars, to_hour_units
+from record_types import parse_timesheet
+
+PRE_TAX_DEDUCTIONS = ['401K% T', 'UNION N', 'UN INST', 'AFLCNTT', 'WILTONN']
+ADDITIONS = ['LONGEVT', 'MEALS N', 'TRAVELN']
+DIS_SUI_CENTS = 60
+
+def split_deductions(deductions):
+    """ Organize deductions into pre-tax and post-tax, and separate additions
+        Consumes: dict (deductions in cents)
+        Returns: dict (pre-tax), dict (post-tax), dict (additions)
+    """
+    pre_tax_deductions = {}
+    post_tax_deductions = {}
+    additions = {}
+
+    for deduction_id, amount in deductions.items():
+        if deduction_id in PRE_TAX_DEDUCTIONS:
+            pre_tax_deductions[deduction_id] = amount
+        elif deduction_id in ADDITIONS:
+            additions[deduction_id] = amount
+        else:
+            post_tax_deductions[deduction_id] = amount
+
+    # Add DIS-SUI deduction
+    post_tax_deductions['DIS-SUI'] = DIS_SUI_CENTS
+
+    return pre_tax_deductions, post_tax_deductions, additions
+
+def calculate_pay_totals(gross_pay, pre_tax_deductions, post_tax_deductions, additions):
+    """ Calculate adjusted gross and net pay in cents
+        Amounts may be integers or NumPy arrays with one value per paystub.
+        Returns: adjusted gross, net pay
+    """
+    # Calculate total pre-tax deductions
+    total_pre_tax = sum(pre_tax_deductions.values())
+
+    # Calculate adjusted gross (gross - pre-tax deductions)
+    adjusted_gross = gross_pay - total_pre_tax
+
+    # Calculate total post-tax deductions
+    total_post_tax = sum(post_tax_deductions.values())
+
+    # Calculate total additions
+    total_additions = sum(additions.values())
+
+    # Calculate net pay (adjusted gross - post-tax deductions + additions)
+    net_pay = adjusted_gross - total_post_tax + total_additions
+
+    return adjusted_gross, net_pay
+
+def to_dollar_amounts(amounts):
+    """Convert a dict of cent amounts to dollars"""
+    return {name: to_dollars(cents) for name, cents in amounts.items()}
+
+def calculate_paystub(timesheet, employee, deduction_plan=None, hours=None):
+    """ Calculate a paystub from a timesheet and an employee record
+        Consumes: Timesheet (a dict is parsed first), dict (employee),
+                  compiled deduction plan
+                  (optional, compiled from the employee when omitted),
+                  dict (weekly hours, optional, calculated when omitted)
+        Returns: dict (paystub)
+    """
+    if not employee:
+        raise ValueError("Employee not found.")
+
+    # Entries are parsed once for both the hours and the days worked
+    timesheet = parse_timesheet(timesheet)
+
+    # Calculate hours
+    if hours is None:
+        hours = calculate_weekly_hours(timesheet)
+
+    # Calculate days worked
+    days_worked = count_days_worked(timesheet)
+
+    # Calculate wages in cents, each line item rounded to the cent
+    hour_units = {category: to_hour_units(hours[category]) for category in WAGE_CATEGORIES}
+    wages = calculate_wages_cents(hour_units, employee['pay_rate'])
+
+    # Calculate gross pay
+    gross_pay = sum(wages.values())
+
+    # Calculate deductions
+    deductions = calculate_deductions_cents(gross_pay, employee, days_worked, deduction_plan)
+
+    # Organize deductions and total the pay
+    pre_tax_deductions, post_tax_deductions, additions = split_deductions(deductions)
+    adjusted_gross, net_pay = calculate_pay_totals(
+        gross_pay, pre_tax_deductions, post_tax_deductions, additions
+    )
+
+    # Create paystub data, converting cents back to dollars
+    paystub_data = {
+        'week_end': timesheet.week_end,
+        'hours': hours,
+        'wages': to_dollar_amounts(wages),
+        'pay': {
+            'gross': to_dollars(gross_pay),
+            'adjusted_gross': to_dollars(adjusted_gross),
+            'net': to_dollars(net_pay)
+        },
+        'pre_tax_deductions': to_dollar_amounts(pre_tax_deductions),
+        'post_tax_deductions': to_dollar_amounts(post_tax_deductions),
+        'additions': to_dollar_amounts(additions)
+    }
+
+    # Employees from the multi-employee directory carry their id
+    if employee.get('employee_id'):
+        paystub_data['employee_id'] = employee['employee_id']
+
+    return paystub_data
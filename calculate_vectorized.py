@@ -0,0 +1,164 @@
+""" Vectorized wage and deduction engine for batch payroll runs
+
+The integer-cents calculators in calculate_wages, calculate_deductions and
+calculate_paystub only use arithmetic operators, so they also work on
+NumPy integer arrays holding one value per employee-week. This engine
+builds those arrays for a whole batch, runs each wage category and
+deduction rule once per array instead of once per paystub, and unpacks
+the results into the usual paystub dicts. The integer arithmetic and the
+rounding rules are the same as the scalar path, so results match it to
+the cent. Items whose rates or hours could overflow the int64 arrays are
+calculated with the scalar path instead.
+
+NumPy is an optional dependency and is only needed when this engine is used.
+"""
+from fractions import Fraction
+from calculate_hours import calculate_weekly_hours, count_days_worked
+from calculate_wages import DIFF_RATE, WAGE_CATEGORIES, calculate_wages_cents
+from calculate_deductions import (
+    PER_DAY, PERCENTAGE, calculate_deductions_cents, compile_deduction_plan
+)
+from calculate_paystub import calculate_paystub, split_deductions, calculate_pay_totals
+from money import HOUR_UNITS, rate_fraction, to_dollars, to_hour_units
+from numpy_support import import_numpy
+from record_types import parse_timesheet
+
+INT64_MAX = 2 ** 63 - 1
+
+def _fits_int64(hour_units, rate, plan, days_worked):
+    """Check that every intermediate product of an item fits in an int64
+
+    apply_rate computes 2 * amount * numerator + denominator * divisor, so
+    each rate is checked against the largest amount it is applied to:
+    the hours for wages, and for percentage deductions a bound on gross
+    pay plus everything that can be deducted from it.
+    """
+    wage_rates = [rate, (rate[0] * 3, rate[1] * 2), rate_fraction(DIFF_RATE)]
+    amount = max(hour_units.values()) * 100
+    for numerator, denominator in wage_rates:
+        if 2 * amount * abs(numerator) + 2 * denominator * HOUR_UNITS > INT64_MAX:
+            return False
+
+    highest_rate = max(abs(Fraction(*wage_rate)) for wage_rate in wage_rates)
+    gross = sum(hour_units.values()) * 100 * highest_rate / HOUR_UNITS + len(WAGE_CATEGORIES)
+    base = gross
+    terms = [term for plan_terms in plan for term in plan_terms]
+    for name, kind, value in terms:
+        if kind == PERCENTAGE:
+            base += gross * abs(Fraction(*value)) + 1
+        elif kind == PER_DAY:
+            base += abs(value) * days_worked
+        else:
+            base += abs(value)
+    return all(
+        2 * base * abs(value[0]) + value[1] <= INT64_MAX
+        for name, kind, value in terms if kind == PERCENTAGE
+    )
+
+def calculate_paystubs_vectorized(items):
+    """ Calculate paystubs for (employee, timesheet) pairs in bulk
+        Consumes: list of (dict (employee), Timesheet or timesheet dict)
+        Returns: list of (dict (paystub), str (error)) like calculate_paystubs
+    """
+    np = import_numpy("The vectorized payroll engine")
+
+    results = [None] * len(items)
+    week_ends = []
+    hours_list = []
+    units_list = []
+    rates = []
+    days = []
+    rows = []
+    groups = {}
+    plans = {}
+
+    # Hours come from the per-timesheet calculation; only well formed
+    # items go on to the array stage
+    for index, (employee, timesheet) in enumerate(items):
+        try:
+            if not employee:
+                raise ValueError("Employee not found.")
+            timesheet = parse_timesheet(timesheet)
+            hours = calculate_weekly_hours(timesheet)
+            rate = rate_fraction(employee['pay_rate'])
+            days_worked = count_days_worked(timesheet)
+            # Items sharing an employee record share its deduction rules
+            if id(employee) not in plans:
+                plans[id(employee)] = compile_deduction_plan(employee)
+            plan = plans[id(employee)]
+            units = {category: to_hour_units(hours[category]) for category in WAGE_CATEGORIES}
+            if not _fits_int64(units, rate, plan, days_worked):
+                results[index] = (calculate_paystub(timesheet, employee, plan, hours), None)
+                continue
+        except ValueError as e:
+            results[index] = (None, str(e))
+            continue
+        except Exception as e:
+            results[index] = (None, f"An error occurred: {str(e)}")
+            continue
+
+        week_ends.append(timesheet.week_end)
+        hours_list.append(hours)
+        units_list.append(units)
+        rates.append(rate)
+        days.append(days_worked)
+
+        groups.setdefault(id(employee), (employee, plan, []))[2].append(len(rows))
+        rows.append(index)
+
+    if not rows:
+        return results
+
+    # Wages and gross pay in cents, one array per category
+    hour_units = {
+        category: np.array([units[category] for units in units_list], dtype=np.int64)
+        for category in WAGE_CATEGORIES
+    }
+    reg_rate = (
+        np.array([rate[0] for rate in rates], dtype=np.int64),
+        np.array([rate[1] for rate in rates], dtype=np.int64)
+    )
+    wages = calculate_wages_cents(hour_units, reg_rate)
+    gross_pay = sum(wages.values())
+    days_worked = np.array(days, dtype=np.int64)
+
+    # Deductions, evaluated once per rule for each employee's rows
+    for employee, plan, positions in groups.values():
+        positions = np.array(positions)
+        group_gross = gross_pay[positions]
+        deductions = calculate_deductions_cents(group_gross, employee, days_worked[positions], plan)
+        pre_tax_deductions, post_tax_deductions, additions = split_deductions(deductions)
+        adjusted_gross, net_pay = calculate_pay_totals(
+            group_gross, pre_tax_deductions, post_tax_deductions, additions
+        )
+
+        for offset, position in enumerate(positions):
+            index = rows[position]
+            paystub_data = {
+                'week_end': week_ends[position],
+                'hours': hours_list[position],
+                'wages': {
+                    category: to_dollars(wages[category][position].item())
+                    for category in WAGE_CATEGORIES
+                },
+                'pay': {
+                    'gross': to_dollars(gross_pay[position].item()),
+                    'adjusted_gross': to_dollars(adjusted_gross[offset].item()),
+                    'net': to_dollars(net_pay[offset].item())
+                },
+                'pre_tax_deductions': _unpack(pre_tax_deductions, offset),
+                'post_tax_deductions': _unpack(post_tax_deductions, offset),
+                'additions': _unpack(additions, offset)
+            }
+            if employee.get('employee_id'):
+                paystub_data['employee_id'] = employee['employee_id']
+            results[index] = (paystub_data, None)
+
+    return results
+
+def _unpack(amounts, offset):
+    """Pick one paystub's dollar values out of a dict of cent arrays and scalars"""
+    return {
+        name: to_dollars(amount[offset].item() if hasattr(amount, 'shape') else amount)
+        for name, amount in amounts.items()
+    }
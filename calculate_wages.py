@@ -1,31 +1,37 @@
+from money import HOUR_UNITS, apply_rate, rate_fraction, to_dollars, to_hour_units
+
 DIFF_RATE = 1.4186
 
+WAGE_CATEGORIES = ['Regular', 'Regular OT', 'Holiday', 'Holiday OT', 'Vacation', 'Sick', 'Differential']
+
+def calculate_wages_cents(hour_units, reg_rate):
+    """ Calculate gross wages in cents based upon hours worked
+        Consumes: dict (hours in money.HOUR_UNITS), float or str (reg_rate),
+                  or an exact (numerator, denominator) pair for reg_rate
+        Returns: dict (wages in cents, each rounded half up to the cent)
+    """
+    reg = reg_rate if isinstance(reg_rate, tuple) else rate_fraction(reg_rate)
+    ot = (reg[0] * 3, reg[1] * 2)  # OT rate is 1.5 times the regular rate
+    diff = rate_fraction(DIFF_RATE)
+
+    def wage(rate, category):
+        return apply_rate(hour_units[category] * 100, rate, HOUR_UNITS)
+
+    return {
+        'Regular': wage(reg, 'Regular'),
+        'Regular OT': wage(ot, 'Regular OT'),
+        'Holiday': wage(reg, 'Holiday'),
+        'Holiday OT': wage(ot, 'Holiday OT'),
+        'Vacation': wage(reg, 'Vacation'),
+        'Sick': wage(reg, 'Sick'),
+        'Differential': wage(diff, 'Differential')
+    }
+
 def calculate_wages(hours, reg_rate):
     """ Calculate gross wages based upon hours worked
         Consumes: dict (hours), float (reg_rate)
         Returns: dict (wages)
     """
-    wages = {
-        'Regular': 0.00,
-        'Regular OT': 0.00,
-        'Holiday': 0.00,
-        'Holiday OT': 0.00,
-        'Vacation': 0.00,
-        'Sick': 0.00,
-        'Differential': 0.00
-    }
-
-    ot_rate = reg_rate * 1.5  # Calculate OT rate based on regular rate
-
-    wages['Regular'] = reg_rate * hours['Regular']
-    wages['Regular OT'] = ot_rate * hours['Regular OT']
-    
-    wages['Holiday'] = reg_rate * hours['Holiday']
-    wages['Holiday OT'] = ot_rate * hours['Holiday OT']
-   
-    wages['Vacation'] = reg_rate * hours['Vacation']
-    wages['Sick'] = reg_rate * hours['Sick']
-    
-    wages['Differential'] = DIFF_RATE * hours['Differential']
-    
-    return wages
+    hour_units = {category: to_hour_units(hours[category]) for category in WAGE_CATEGORIES}
+    wages = calculate_wages_cents(hour_units, reg_rate)
+    return {category: to_dollars(cents) for category, cents in wages.items()}
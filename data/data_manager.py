@@ -2,24 +2,134 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
+from record_types import Timesheet, json_default, to_dict
+from .week_index import WeekIndex
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, data_dir='data', employee_id='Employee'):
         # Create data directory if it doesn't exist
-        self.data_dir = Path('data')
+        self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
         # Define file paths
         self.employee_file = self.data_dir / 'employees.json'
         self.timesheet_file = self.data_dir / 'timesheets.json'
         self.paystub_file = self.data_dir / 'paystubs.json'
+        self.actual_paystub_file = self.data_dir / 'actual_paystubs.json'
+        self.archive_file = self.data_dir / 'paystubs.archive'
         
+        # Records are keyed as "<employee_id>_<week_end>"
+        self.employee_id = employee_id
+
         # Initialize data stores
         self.employee = None
         self.timesheets = {}
         self.paystubs = {}
+        # Paystubs as issued by the employer, entered for comparison
+        self.actual_paystubs = {}
+        # Sorted week indexes per collection and year to date totals,
+        # built from the stored records on first use
+        self._week_indexes = {}
+        self._ytd_index = None
         self._load_data()
 
+    @property
+    def employee(self):
+        """The employee record"""
+        return self._employee
+
+    @employee.setter
+    def employee(self, employee_data):
+        self._employee = employee_data
+        # Deduction rules are recompiled on next use
+        self._deduction_plan = None
+
+    @property
+    def deduction_plan(self):
+        """Get the employee's deduction rules compiled for calculation"""
+        if self._deduction_plan is None and self._employee:
+            # Imported on first use, like the indexes and the archive
+            # below, so commands that never calculate start faster
+            from calculate_deductions import compile_deduction_plan
+            self._deduction_plan = compile_deduction_plan(self._employee)
+        return self._deduction_plan
+
+    @property
+    def ytd_index(self):
+        """Get the year to date index of the paystubs
+
+        Each year's paystubs are read the first time that year is looked up.
+        """
+        if self._ytd_index is None:
+            from .ytd_index import YTDIndex
+            self._ytd_index = YTDIndex(
+                load_year=lambda year: self.get_paystubs(f"{year}-01-01", f"{year}-12-31")
+            )
+        return self._ytd_index
+
+    def week_index(self, collection):
+        """Get the sorted index of a collection's week end dates"""
+        if collection not in self._week_indexes:
+            self._week_indexes[collection] = WeekIndex(self._week_ends(collection))
+        return self._week_indexes[collection]
+
+    def _week_ends(self, collection):
+        """Get the week end dates of this employee's records in a collection"""
+        # Only keys are read, so record bodies that are loaded lazily stay
+        # unparsed; placeholders such as the stray "timesheets" key lack
+        # the employee prefix
+        prefix = self._key('')
+        return [key[len(prefix):] for key in getattr(self, collection) if key.startswith(prefix)]
+
+    def _index_records(self, collection, records):
+        """Add saved records to the indexes that are already built"""
+        week_index = self._week_indexes.get(collection)
+        for record in records:
+            if week_index is not None:
+                week_index.add(record['week_end'])
+            if collection == 'paystubs' and self._ytd_index is not None:
+                self._ytd_index.add(record)
+
+    def _unindex_record(self, collection, week_end):
+        """Remove a deleted week from the indexes that are already built"""
+        if collection in self._week_indexes:
+            self._week_indexes[collection].remove(week_end)
+        if collection == 'paystubs' and self._ytd_index is not None:
+            self._ytd_index.remove(week_end)
+
+    def _records_between(self, collection, date_from=None, date_to=None):
+        """Get a collection's records in week order, optionally in a date range"""
+        records = getattr(self, collection)
+        return [records[self._key(week_end)]
+                for week_end in self.week_index(collection).between(date_from, date_to)]
+
+    def _parse_record(self, collection, record):
+        """Get the in-memory form of a stored record
+
+        Timesheets are kept as Timesheet records, so their clock times and
+        leave hours are parsed once here rather than on every calculation.
+        A timesheet that can't be parsed is kept as it was stored, and the
+        calculators report its error when it is used.
+        """
+        if collection != 'timesheets' or not isinstance(record, dict) or 'entries' not in record:
+            return record
+        try:
+            return Timesheet.from_dict(record)
+        except (AttributeError, KeyError, TypeError):
+            return record
+
+    def _key(self, week_end):
+        """Get the storage key of this employee's record for a week"""
+        return f"{self.employee_id}_{week_end}"
+
+    def _collection_file(self, collection):
+        """Get the JSON file that holds a record collection"""
+        return {
+            'timesheets': self.timesheet_file,
+            'paystubs': self.paystub_file,
+            'actual_paystubs': self.actual_paystub_file
+        }[collection]
+
     def _load_data(self):
         """Load all data from JSON files."""
         try:
@@ -32,81 +142,206 @@ class DataManager:
             # Load timesheets
             if self.timesheet_file.exists():
                 with open(self.timesheet_file, 'r') as f:
-                    self.timesheets = json.load(f)
+                    self.timesheets = {
+                        key: self._parse_record('timesheets', record)
+                        for key, record in json.load(f).items()
+                    }
 
             # Load paystubs
             if self.paystub_file.exists():
                 with open(self.paystub_file, 'r') as f:
                     self.paystubs = json.load(f)
+
+            # Load actual paystubs
+            if self.actual_paystub_file.exists():
+                with open(self.actual_paystub_file, 'r') as f:
+                    self.actual_paystubs = json.load(f)
         except Exception as e:
             print(f"Error loading data: {str(e)}")
 
     def _save_data(self):
         """Save all data to JSON files."""
+        self._save_employee()
+        self._save_collection('timesheets')
+        self._save_collection('paystubs')
+        self._save_collection('actual_paystubs')
+
+    def _save_employee(self):
+        """Save employee data to its JSON file."""
         try:
-            # Save employee data
             with open(self.employee_file, 'w') as f:
                 json.dump({'Employee': self.employee}, f, indent=4)
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
 
-            # Save timesheets
-            with open(self.timesheet_file, 'w') as f:
-                json.dump(self.timesheets, f, indent=4)
-
-            # Save paystubs
-            with open(self.paystub_file, 'w') as f:
-                json.dump(self.paystubs, f, indent=4)
+    def _save_collection(self, collection):
+        """Save one record collection to its JSON file."""
+        try:
+            self._write_collection(collection, getattr(self, collection))
         except Exception as e:
             print(f"Error saving data: {str(e)}")
 
+    def _write_collection(self, collection, records):
+        """Write the records of a collection to its JSON file"""
+        with open(self._collection_file(collection), 'w') as f:
+            json.dump(records, f, indent=4, default=json_default)
+
+    def _save_record(self, collection, key):
+        """Persist a single added or updated record.
+
+        The monolithic JSON layout can only rewrite the file holding the
+        record; storage modes with finer-grained files override this.
+        """
+        self._save_collection(collection)
+
+    def _save_records(self, collection, records):
+        """Persist several added or updated records with one write
+
+        records maps storage keys to the new records. They are written from
+        these values and only put in the collection afterwards. Unlike the
+        single record saves, a failed write raises its error.
+        """
+        self._write_collection(collection, {**getattr(self, collection), **records})
+
+    def _remove_record(self, collection, key):
+        """Persist the removal of a single record"""
+        self._save_collection(collection)
+
+    def _add_records(self, collection, records):
+        """Add or update several records, save them together and index them
+
+        Raises the storage error when the write fails. The records are then
+        neither kept in memory nor indexed.
+        """
+        batch = {self._key(record['week_end']): record for record in records}
+        self._save_records(collection, batch)
+        getattr(self, collection).update(
+            (key, self._parse_record(collection, record)) for key, record in batch.items()
+        )
+        self._index_records(collection, records)
+
+    def close(self):
+        """Flush pending writes. Every change is already on disk here."""
+        pass
+
+    # Employee operations
+    def update_employee(self, employee_data):
+        """Replace the employee record and save it"""
+        self.employee = employee_data
+        self._save_employee()
+
     # Timesheet operations
     def add_timesheet(self, timesheet_data):
         """Add or update timesheet"""
-        key = f"Employee_{timesheet_data['week_end']}"
-        self.timesheets[key] = timesheet_data
-        self._save_data()
+        key = self._key(timesheet_data['week_end'])
+        self.timesheets[key] = self._parse_record('timesheets', timesheet_data)
+        self._save_record('timesheets', key)
+        self._index_records('timesheets', [timesheet_data])
+
+    def add_timesheets(self, timesheets):
+        """Add or update several timesheets and save them together, raising on failure"""
+        self._add_records('timesheets', timesheets)
 
     def get_timesheet(self, week_end):
         """Get timesheet by week start date"""
-        key = f"Employee_{week_end}"
+        return to_dict(self.get_parsed_timesheet(week_end))
+
+    def get_parsed_timesheet(self, week_end):
+        """Get a week's timesheet as a Timesheet record for the calculators"""
+        key = self._key(week_end)
         return self.timesheets.get(key)
 
     def delete_timesheet(self, week_end):
         """Delete timesheet"""
-        key = f"Employee_{week_end}"
+        key = self._key(week_end)
         if key in self.timesheets:
             del self.timesheets[key]
-            self._save_data()
+            self._remove_record('timesheets', key)
+            self._unindex_record('timesheets', week_end)
             return True
         return False
 
-    def get_timesheets(self):
-        """Get all timesheets"""
-        # Filter out the "timesheets" key and return only the actual timesheet data
-        return [timesheet for key, timesheet in self.timesheets.items() 
-                if key != "timesheets" and isinstance(timesheet, dict)]
+    def get_timesheets(self, date_from=None, date_to=None):
+        """Get all timesheets, or those in a week end date range, in week order"""
+        return [to_dict(timesheet) for timesheet in self.get_parsed_timesheets(date_from, date_to)]
+
+    def get_parsed_timesheets(self, date_from=None, date_to=None):
+        """Get timesheets as Timesheet records, like get_timesheets"""
+        return self._records_between('timesheets', date_from, date_to)
 
     # Paystub operations
     def add_paystub(self, paystub_data):
         """Add or update paystub"""
-        key = f"Employee_{paystub_data['week_end']}"
+        key = self._key(paystub_data['week_end'])
         self.paystubs[key] = paystub_data
-        self._save_data()
+        self._save_record('paystubs', key)
+        self._index_records('paystubs', [paystub_data])
+
+    def add_paystubs(self, paystubs):
+        """Add or update several paystubs and save them together, raising on failure"""
+        self._add_records('paystubs', paystubs)
 
     def get_paystub(self, week_end):
         """Get paystub by week start date"""
-        key = f"Employee_{week_end}"
+        key = self._key(week_end)
         return self.paystubs.get(key)
 
     def delete_paystub(self, week_end):
         """Delete paystub"""
-        key = f"Employee_{week_end}"
+        key = self._key(week_end)
         if key in self.paystubs:
             del self.paystubs[key]
-            self._save_data()
+            self._remove_record('paystubs', key)
+            self._unindex_record('paystubs', week_end)
             return True
         return False
 
-    def get_paystubs(self):
-        """Get all paystubs"""
-        return list(self.paystubs.values())
+    def get_paystubs(self, date_from=None, date_to=None):
+        """Get all paystubs, or those in a week end date range, in week order"""
+        return self._records_between('paystubs', date_from, date_to)
+
+    def get_ytd(self, week_end):
+        """Get year to date paystub totals through a week"""
+        return self.ytd_index.get_ytd(week_end)
+
+    # Paystub archive
+    def archive_paystubs(self, date_to=None):
+        """Pack the paystubs through date_to into the binary archive"""
+        from .paystub_archive import write_archive
+        return write_archive(self.archive_file, self.get_paystubs(None, date_to), self.employee_id)
+
+    def open_archive(self):
+        """Open the binary paystub archive, memory-mapped"""
+        from .paystub_archive import PaystubArchive
+        return PaystubArchive(self.archive_file)
+
+    # Actual paystub operations
+    def add_actual_paystub(self, paystub_data):
+        """Add or update an employer-issued paystub"""
+        key = self._key(paystub_data['week_end'])
+        self.actual_paystubs[key] = paystub_data
+        self._save_record('actual_paystubs', key)
+        self._index_records('actual_paystubs', [paystub_data])
+
+    def add_actual_paystubs(self, paystubs):
+        """Add or update several employer-issued paystubs together, raising on failure"""
+        self._add_records('actual_paystubs', paystubs)
+
+    def get_actual_paystub(self, week_end):
+        """Get the employer-issued paystub for a week"""
+        key = self._key(week_end)
+        return self.actual_paystubs.get(key)
+
+    def delete_actual_paystub(self, week_end):
+        """Delete an employer-issued paystub"""
+        key = self._key(week_end)
+        if key in self.actual_paystubs:
+            del self.actual_paystubs[key]
+            self._remove_record('actual_paystubs', key)
+            self._unindex_record('actual_paystubs', week_end)
+            return True
+        return False
 
+    def get_actual_paystubs(self, date_from=None, date_to=None):
+        """Get all employer-issued paystubs, or those in a week end date range"""
+        return self._records_between('actual_paystubs', date_from, date_to)
@@ -0,0 +1,90 @@
+import re
+from pathlib import Path
+from .storage import open_data_manager
+
+EMPLOYEE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+class EmployeeDirectory:
+    """Multi-employee store with one storage shard per employee.
+
+    Each employee gets a directory under data/employees/<employee_id> that
+    holds a regular DataManager for that employee alone, with records keyed
+    as "<employee_id>_<week_end>". Shards are opened on first use, so
+    loading or saving one employee never touches another employee's files.
+    The single-employee operations classes work unchanged on a shard.
+    Only add_employee and import_data_manager create a shard.
+    """
+
+    def __init__(self, data_dir='data', storage=None):
+        self.data_dir = Path(data_dir)
+        self.shard_dir = self.data_dir / 'employees'
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.storage = storage
+        self.shards = {}
+
+    def _validate_employee_id(self, employee_id):
+        """Employee ids double as directory names and record key prefixes"""
+        if not employee_id or not EMPLOYEE_ID_PATTERN.match(employee_id):
+            raise ValueError("Employee ID may only contain letters, digits, '-' and '_'")
+
+    def employee_ids(self):
+        """Get the ids of all stored employees"""
+        return sorted(path.name for path in self.shard_dir.iterdir() if path.is_dir())
+
+    def has_employee(self, employee_id):
+        """Check whether an employee shard exists"""
+        return (self.shard_dir / employee_id).is_dir()
+
+    def get_shard(self, employee_id):
+        """Get the DataManager holding one employee's data
+
+        Raises ValueError for an employee that is not in the directory.
+        """
+        self._validate_employee_id(employee_id)
+        if employee_id not in self.shards and not self.has_employee(employee_id):
+            raise ValueError(f"Unknown employee '{employee_id}'")
+        return self._open_shard(employee_id)
+
+    def _open_shard(self, employee_id):
+        """Open an employee's shard, creating its directory if needed"""
+        if employee_id not in self.shards:
+            self.shards[employee_id] = open_data_manager(
+                self.storage, self.shard_dir / employee_id, employee_id
+            )
+        return self.shards[employee_id]
+
+    # Employee operations
+    def add_employee(self, employee_id, employee_data):
+        """Add or update an employee record"""
+        self._validate_employee_id(employee_id)
+        employee_data = dict(employee_data, employee_id=employee_id)
+        self._open_shard(employee_id).update_employee(employee_data)
+        return employee_data
+
+    def get_employee(self, employee_id):
+        """Get an employee record by id"""
+        if not self.has_employee(employee_id):
+            return None
+        return self.get_shard(employee_id).employee
+
+    def import_data_manager(self, employee_id, data_manager):
+        """Copy a single-employee DataManager into a new shard
+
+        Each collection is saved with one batch write. Raises ValueError if
+        the employee is already in the directory.
+        """
+        self._validate_employee_id(employee_id)
+        if self.has_employee(employee_id):
+            raise ValueError(f"Employee '{employee_id}' already exists")
+        self.add_employee(employee_id, data_manager.employee or {})
+        shard = self.get_shard(employee_id)
+        shard.add_timesheets(data_manager.get_timesheets())
+        shard.add_paystubs(data_manager.get_paystubs())
+        shard.add_actual_paystubs(data_manager.get_actual_paystubs())
+        return shard
+
+    def close(self):
+        """Close every open shard"""
+        for shard in self.shards.values():
+            shard.close()
+        self.shards = {}
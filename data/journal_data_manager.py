@@ -0,0 +1,162 @@
+import atexit
+import json
+import os
+from record_types import json_default
+from .data_manager import DataManager
+
+class JournalDataManager(DataManager):
+    """DataManager that appends changes to a write-ahead journal.
+
+    Every mutation appends one line to data/journal.jsonl instead of
+    rewriting a snapshot file. On startup the snapshot JSON files are loaded
+    and the journal is replayed on top of them. Once the journal grows past
+    COMPACT_THRESHOLD entries, and again when the application exits, the
+    journal is folded back into the snapshot files.
+    """
+
+    COMPACT_THRESHOLD = 500
+
+    def __init__(self, data_dir='data', employee_id='Employee', sync=True):
+        self.sync = sync
+        self.journal_entries = 0
+        self._journal = None
+        super().__init__(data_dir, employee_id)
+        self.journal_file = self.data_dir / 'journal.jsonl'
+        self._journal = open(self.journal_file, 'a')
+        atexit.register(self.close)
+
+    def _load_data(self):
+        """Load the snapshot files and replay the journal on top of them."""
+        super()._load_data()
+        journal_file = self.data_dir / 'journal.jsonl'
+        if not journal_file.exists():
+            return
+
+        try:
+            torn_at = None
+            with open(journal_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("Unterminated journal line")
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append
+                        torn_at = offset
+                        break
+                    self._apply_entry(entry)
+                    self.journal_entries += 1
+                    offset += len(line)
+            if torn_at is not None:
+                # Cut the fragment off so new appends start on a fresh line
+                os.truncate(journal_file, torn_at)
+        except Exception as e:
+            print(f"Error loading data: {str(e)}")
+
+    def _apply_entry(self, entry):
+        """Apply one journal entry to the in-memory stores"""
+        if entry['op'] == 'employee':
+            self.employee = entry['record']
+        elif entry['op'] == 'put':
+            getattr(self, entry['collection'])[entry['key']] = self._parse_record(
+                entry['collection'], entry['record']
+            )
+        elif entry['op'] == 'delete':
+            getattr(self, entry['collection']).pop(entry['key'], None)
+
+    def _write_entries(self, entries):
+        """Append entries to the journal and flush them to disk"""
+        self._journal.write(''.join(json.dumps(entry, default=json_default) + '\n' for entry in entries))
+        self._journal.flush()
+        if self.sync:
+            os.fsync(self._journal.fileno())
+        self.journal_entries += len(entries)
+
+    def _append(self, *entries):
+        """Append changes to the journal and compact when it gets long"""
+        try:
+            self._write_entries(entries)
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+            return
+
+        self._compact_if_long()
+
+    def _compact_if_long(self):
+        """Compact once the journal has grown past the threshold"""
+        if self.journal_entries >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _save_employee(self):
+        """Journal the new employee record."""
+        self._append({'op': 'employee', 'record': self.employee})
+
+    def _save_record(self, collection, key):
+        """Journal an added or updated record."""
+        self._append({
+            'op': 'put',
+            'collection': collection,
+            'key': key,
+            'record': getattr(self, collection)[key]
+        })
+
+    def _save_records(self, collection, records):
+        """Journal several records with a single flush, raising on failure.
+
+        The records are not in memory yet, so compaction waits for
+        _add_records to put them there.
+        """
+        self._write_entries([
+            {'op': 'put', 'collection': collection, 'key': key, 'record': record}
+            for key, record in records.items()
+        ])
+
+    def _add_records(self, collection, records):
+        """Add several records, then compact if the journal got long"""
+        super()._add_records(collection, records)
+        self._compact_if_long()
+
+    def _remove_record(self, collection, key):
+        """Journal a deleted record."""
+        self._append({'op': 'delete', 'collection': collection, 'key': key})
+
+    def _save_data(self):
+        """Save all data by compacting the journal into the snapshots."""
+        self.compact()
+
+    def _write_snapshot(self, path, data):
+        """Write a snapshot file atomically so a crash never truncates it"""
+        temp_file = path.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=4, default=json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+
+    def compact(self):
+        """Fold the journal into the snapshot files and truncate it"""
+        try:
+            self._write_snapshot(self.employee_file, {'Employee': self.employee})
+            self._write_snapshot(self.timesheet_file, self.timesheets)
+            self._write_snapshot(self.paystub_file, self.paystubs)
+            self._write_snapshot(self.actual_paystub_file, self.actual_paystubs)
+
+            # Snapshots are durable, the journal can start over. Replaying
+            # a journal that survives a crash here is harmless.
+            if self._journal:
+                self._journal.close()
+            self._journal = open(self.journal_file, 'w')
+            self.journal_entries = 0
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def close(self):
+        """Compact the journal and release the journal file"""
+        if self._journal is None:
+            return
+        if self.journal_entries:
+            self.compact()
+        self._journal.close()
+        self._journal = None
+        atexit.unregister(self.close)
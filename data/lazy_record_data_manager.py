@@ -0,0 +1,98 @@
+import json
+import os
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from .record_data_manager import RecordDataManager
+
+# Parsed records kept in memory per collection
+DEFAULT_CACHE_SIZE = 256
+
+class LazyRecords(MutableMapping):
+    """Record collection that parses each record the first time it is used
+
+    Only the keys are known up front. Parsed records are kept in a least
+    recently used cache of at most max_size records, so memory does not
+    grow with the number of stored weeks. Records that are added stay
+    cached until they are evicted; by then they have been saved, so they
+    are read back from their file when needed again.
+    """
+    def __init__(self, load_record, keys, max_size=DEFAULT_CACHE_SIZE):
+        self.load_record = load_record
+        self.index = set(keys)
+        self.cache = OrderedDict()
+        self.max_size = max(1, max_size)
+
+    def _remember(self, key, record):
+        self.cache[key] = record
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    def __getitem__(self, key):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key not in self.index:
+            raise KeyError(key)
+        record = self.load_record(key)
+        self._remember(key, record)
+        return record
+
+    def __setitem__(self, key, record):
+        self.index.add(key)
+        self._remember(key, record)
+
+    def __delitem__(self, key):
+        self.index.remove(key)
+        self.cache.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(sorted(self.index))
+
+    def __len__(self):
+        return len(self.index)
+
+class LazyRecordDataManager(RecordDataManager):
+    """Per-record file storage that loads record bodies on demand.
+
+    Uses the same data/<collection>/<key>.json layout as RecordDataManager,
+    but startup only lists the record files. A timesheet or paystub is
+    parsed the first time it is asked for and kept in a bounded cache, so
+    opening the app takes the same time and memory however many weeks are
+    stored.
+    """
+
+    def __init__(self, data_dir='data', employee_id='Employee', cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        super().__init__(data_dir, employee_id)
+
+    def _load_data(self):
+        """Load employee data and the keys of every per-record file."""
+        try:
+            # Load employee data
+            if self.employee_file.exists():
+                with open(self.employee_file, 'r') as f:
+                    data = json.load(f)
+                    self.employee = data.get('Employee', None)
+
+            for collection in self.COLLECTIONS:
+                record_dir = self._collection_dir(collection)
+                if not record_dir.exists():
+                    # First run in this layout: split the monolithic file
+                    self._migrate_collection(collection)
+                with os.scandir(record_dir) as entries:
+                    keys = [entry.name[:-5] for entry in entries if entry.name.endswith('.json')]
+                setattr(self, collection, LazyRecords(
+                    lambda key, collection=collection: self._read_record(collection, key),
+                    keys, self.cache_size
+                ))
+        except Exception as e:
+            print(f"Error loading data: {str(e)}")
+
+    def _read_record(self, collection, key):
+        """Parse one record file"""
+        with open(self._record_file(collection, key), 'r') as f:
+            return self._parse_record(collection, json.load(f))
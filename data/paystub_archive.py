@@ -0,0 +1,218 @@
+""" Memory-mapped binary archive of closed pay periods
+
+Paystubs are packed into fixed-width little-endian records, one per week
+in week order:
+
+    week_end     10 bytes   YYYY-MM-DD
+    employee_id  22 bytes   UTF-8, zero padded
+    values       8 bytes each, one int64 per schema line
+
+The schema lists every (section, name) line found in the archived
+paystubs: hours per wage category in hour units, then wages, pay totals,
+deductions and additions in cents. A line a paystub does not have is
+stored as zero. The file starts with a small header:
+
+    magic        8 bytes    b'PAYSTUBA'
+    version      uint32
+    header size  uint32
+    header       JSON with employee_id, count and fields, padded to 8 bytes
+
+Opening an archive maps the file instead of reading it. Records are read
+in place, as memoryview slices, as decoded paystub dicts, or all at once
+as a NumPy structured array over the mapped bytes. NumPy is only needed
+for to_numpy().
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from money import HOUR_UNITS, to_dollars
+from numpy_support import import_numpy
+from .ytd_index import SECTIONS, paystub_lines
+
+MAGIC = b'PAYSTUBA'
+VERSION = 1
+PREAMBLE = struct.Struct('<8sII')
+WEEK_BYTES = 10
+EMPLOYEE_BYTES = 22
+
+def _record_struct(field_count):
+    return struct.Struct(f'<{WEEK_BYTES}s{EMPLOYEE_BYTES}s{field_count}q')
+
+def _field_name(field):
+    """Get the NumPy field name of a (section, name) line"""
+    return f"{field[0]}:{field[1]}"
+
+def write_archive(path, paystubs, employee_id=''):
+    """Pack paystubs into an archive file, replacing any previous archive
+
+    Returns: int (number of paystubs archived)
+    """
+    employee_bytes = employee_id.encode('utf-8')
+    if len(employee_bytes) > EMPLOYEE_BYTES:
+        raise ValueError(f"Employee ID is longer than {EMPLOYEE_BYTES} bytes")
+
+    paystubs = sorted(paystubs, key=lambda paystub: paystub['week_end'])
+    rows = [paystub_lines(paystub) for paystub in paystubs]
+
+    # Schema lines grouped by section, in the order they first appear
+    found = {}
+    for lines in rows:
+        found.update(dict.fromkeys(lines))
+    fields = sorted(found, key=lambda field: SECTIONS.index(field[0]))
+
+    header = json.dumps({
+        'employee_id': employee_id,
+        'count': len(paystubs),
+        'fields': [list(field) for field in fields]
+    }).encode('utf-8')
+    header += b' ' * (-(PREAMBLE.size + len(header)) % 8)
+
+    record = _record_struct(len(fields))
+    path = Path(path)
+    temp_file = path.with_suffix('.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for paystub, lines in zip(paystubs, rows):
+            f.write(record.pack(
+                paystub['week_end'].encode('ascii'), employee_bytes,
+                *[lines.get(field, 0) for field in fields]
+            ))
+    os.replace(temp_file, path)
+    return len(paystubs)
+
+class PaystubArchive:
+    """Read-only, memory-mapped view of an archive file
+
+    Record views and NumPy arrays from to_numpy() point into the mapping,
+    so they must be released before the archive is closed.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, header_size = PREAMBLE.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a paystub archive")
+            if version != VERSION:
+                raise ValueError(f"Unsupported paystub archive version {version}")
+            header = json.loads(self._map[PREAMBLE.size:PREAMBLE.size + header_size])
+        except (struct.error, ValueError):
+            self._map.close()
+            raise
+
+        self.employee_id = header['employee_id']
+        self.count = header['count']
+        self.fields = [tuple(field) for field in header['fields']]
+        self.record = _record_struct(len(self.fields))
+        self.data_offset = PREAMBLE.size + header_size
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _offset(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("Archive record out of range")
+        return self.data_offset + index * self.record.size
+
+    def view(self, index):
+        """Get the raw bytes of a record without copying them"""
+        offset = self._offset(index)
+        return memoryview(self._map)[offset:offset + self.record.size]
+
+    def week_end(self, index):
+        """Get the week end date of a record"""
+        offset = self._offset(index)
+        return self._map[offset:offset + WEEK_BYTES].decode('ascii')
+
+    def __getitem__(self, index):
+        """Decode a record into the paystub layout"""
+        week_end, employee_id, *values = self.record.unpack_from(self._map, self._offset(index))
+        return self._decode(week_end, employee_id, values)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def _decode(self, week_end, employee_id, values):
+        paystub = {section: {} for section in SECTIONS}
+        paystub['week_end'] = week_end.decode('ascii')
+        paystub['employee_id'] = employee_id.rstrip(b'\0').decode('utf-8')
+        for (section, name), value in zip(self.fields, values):
+            paystub[section][name] = value / HOUR_UNITS if section == 'hours' else to_dollars(value)
+        return paystub
+
+    def _bisect(self, week_end, after=False):
+        """Binary search the week-ordered records"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current = self.week_end(middle)
+            if current < week_end or (after and current == week_end):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, week_end):
+        """Get the record index of a week, or None if it is not archived"""
+        index = self._bisect(week_end)
+        if index < self.count and self.week_end(index) == week_end:
+            return index
+        return None
+
+    def between(self, date_from=None, date_to=None):
+        """Get the range of record indexes from date_from through date_to"""
+        start = self._bisect(date_from) if date_from else 0
+        end = self._bisect(date_to, after=True) if date_to else self.count
+        return range(start, max(start, end))
+
+    def totals(self, date_from=None, date_to=None):
+        """Sum every line over a date range, laid out like a paystub
+
+        Returns: dict of sections plus 'weeks' (number of records summed)
+        """
+        indexes = self.between(date_from, date_to)
+        sums = [0] * len(self.fields)
+        if indexes:
+            start = self._offset(indexes.start)
+            end = start + len(indexes) * self.record.size
+            for week_end, employee_id, *values in self.record.iter_unpack(memoryview(self._map)[start:end]):
+                sums = [total + value for total, value in zip(sums, values)]
+        totals = {section: {} for section in SECTIONS}
+        for (section, name), total in zip(self.fields, sums):
+            totals[section][name] = total / HOUR_UNITS if section == 'hours' else to_dollars(total)
+        totals['weeks'] = len(indexes)
+        return totals
+
+    def numpy_dtype(self):
+        """Get the NumPy structured dtype of a record"""
+        np = import_numpy("Reading the paystub archive as arrays")
+        return np.dtype(
+            [('week_end', f'S{WEEK_BYTES}'), ('employee_id', f'S{EMPLOYEE_BYTES}')]
+            + [(_field_name(field), '<i8') for field in self.fields]
+        )
+
+    def to_numpy(self):
+        """Get every record as a structured array over the mapped file
+
+        Field names are "<section>:<name>", e.g. "pay:net" or
+        "pre_tax_deductions:UNION N". Hours are in hour units and amounts
+        in cents.
+        """
+        np = import_numpy("Reading the paystub archive as arrays")
+        return np.frombuffer(self._map, dtype=self.numpy_dtype(), count=self.count, offset=self.data_offset)
+
+    def close(self):
+        """Unmap the archive file"""
+        if not self._map.closed:
+            self._map.close()
@@ -0,0 +1,118 @@
+import json
+import os
+from record_types import json_default
+from .data_manager import DataManager
+
+class RecordDataManager(DataManager):
+    """DataManager that keeps every timesheet and paystub in its own file.
+
+    Records live under data/timesheets/<key>.json, data/paystubs/<key>.json
+    and data/actual_paystubs/<key>.json, so adding, updating or deleting one record only touches that record's
+    file no matter how much history has been stored.
+    """
+
+    COLLECTIONS = ('timesheets', 'paystubs', 'actual_paystubs')
+
+    def _collection_dir(self, collection):
+        """Get the directory that holds one file per record"""
+        return self.data_dir / collection
+
+    def _record_file(self, collection, key):
+        """Get the file path of a single record"""
+        return self._collection_dir(collection) / f"{key}.json"
+
+    def _load_data(self):
+        """Load employee data and every per-record file."""
+        try:
+            # Load employee data
+            if self.employee_file.exists():
+                with open(self.employee_file, 'r') as f:
+                    data = json.load(f)
+                    self.employee = data.get('Employee', None)
+
+            for collection in self.COLLECTIONS:
+                records = {}
+                record_dir = self._collection_dir(collection)
+                if not record_dir.exists():
+                    # First run in this mode: split the monolithic file
+                    self._migrate_collection(collection)
+                for record_file in sorted(record_dir.glob('*.json')):
+                    with open(record_file, 'r') as f:
+                        records[record_file.stem] = self._parse_record(collection, json.load(f))
+                setattr(self, collection, records)
+        except Exception as e:
+            print(f"Error loading data: {str(e)}")
+
+    def _migrate_collection(self, collection):
+        """Split a monolithic collection file into one file per record"""
+        record_dir = self._collection_dir(collection)
+        record_dir.mkdir(exist_ok=True)
+
+        legacy_file = self._collection_file(collection)
+        if not legacy_file.exists():
+            return
+
+        with open(legacy_file, 'r') as f:
+            records = json.load(f)
+        for key, record in records.items():
+            # Skip placeholders such as the stray "timesheets" key
+            if isinstance(record, dict) and 'week_end' in record:
+                self._write_record(collection, key, record)
+
+    def _write_record(self, collection, key, record):
+        """Write one record file, replacing any previous version atomically"""
+        record_file = self._record_file(collection, key)
+        temp_file = record_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(record, f, indent=4, default=json_default)
+        os.replace(temp_file, record_file)
+
+    def _save_collection(self, collection):
+        """Save every record of a collection to its own file."""
+        try:
+            self._collection_dir(collection).mkdir(exist_ok=True)
+            for key, record in getattr(self, collection).items():
+                self._write_record(collection, key, record)
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def _save_record(self, collection, key):
+        """Write only the file of the record that changed."""
+        try:
+            self._collection_dir(collection).mkdir(exist_ok=True)
+            self._write_record(collection, key, getattr(self, collection)[key])
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def _save_records(self, collection, records):
+        """Write only the files of the records that changed.
+
+        Every record is written to a temporary file before any of them
+        replaces its record file, so a failed write leaves the stored
+        records unchanged. The error is raised.
+        """
+        self._collection_dir(collection).mkdir(exist_ok=True)
+        written = []
+        try:
+            for key, record in records.items():
+                record_file = self._record_file(collection, key)
+                temp_file = record_file.with_suffix('.tmp')
+                written.append((temp_file, record_file))
+                with open(temp_file, 'w') as f:
+                    json.dump(record, f, indent=4)
+        except Exception:
+            for temp_file, record_file in written:
+                if temp_file.exists():
+                    temp_file.unlink()
+            raise
+        for temp_file, record_file in written:
+            os.replace(temp_file, record_file)
+
+    def _remove_record(self, collection, key):
+        """Delete only the file of the record that was removed."""
+        try:
+            record_file = self._record_file(collection, key)
+            if record_file.exists():
+                record_file.unlink()
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
@@ -0,0 +1,325 @@
+import json
+import sqlite3
+from record_types import Timesheet, to_dict
+from .data_manager import DataManager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timesheets (
+    employee_id TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    PRIMARY KEY (employee_id, week_end)
+);
+CREATE TABLE IF NOT EXISTS timesheet_entries (
+    employee_id TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    time_in,
+    time_out,
+    is_holiday INTEGER NOT NULL,
+    vacation_hours,
+    sick_hours,
+    PRIMARY KEY (employee_id, week_end, position)
+);
+CREATE TABLE IF NOT EXISTS paystubs (
+    employee_id TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (employee_id, week_end)
+);
+CREATE TABLE IF NOT EXISTS actual_paystubs (
+    employee_id TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (employee_id, week_end)
+);
+"""
+
+class SQLiteDataManager(DataManager):
+    """DataManager backed by an embedded SQLite database.
+
+    Only the employee record is read at startup. Timesheets and paystubs are
+    fetched with indexed queries on (employee_id, week_end) when they are
+    asked for, so opening the app does not depend on the archive size.
+    Existing JSON files are imported the first time the database is created.
+    """
+
+    DATABASE_NAME = 'paystubs.db'
+
+    def __init__(self, data_dir='data', employee_id='Employee'):
+        self.connection = None
+        super().__init__(data_dir, employee_id)
+
+    def _load_data(self):
+        """Open the database and load the employee record."""
+        try:
+            database_file = self.data_dir / self.DATABASE_NAME
+            is_new = not database_file.exists()
+
+            self.connection = sqlite3.connect(database_file)
+            self.connection.executescript(SCHEMA)
+            if is_new:
+                self._import_json()
+
+            row = self.connection.execute(
+                "SELECT record FROM employees WHERE employee_id = ?",
+                (self.employee_id,)
+            ).fetchone()
+            self.employee = json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Error loading data: {str(e)}")
+
+    def _import_json(self):
+        """Import the JSON files into a freshly created database"""
+        super()._load_data()
+        with self.connection:
+            if self.employee is not None:
+                self._write_employee()
+            # The week indexes would read the database, so the loaded
+            # records are listed directly
+            for week_end in DataManager._week_ends(self, 'timesheets'):
+                self._write_timesheet(to_dict(self.timesheets[self._key(week_end)]))
+            for week_end in DataManager._week_ends(self, 'paystubs'):
+                self._write_paystub(self.paystubs[self._key(week_end)])
+            for week_end in DataManager._week_ends(self, 'actual_paystubs'):
+                self._write_paystub(self.actual_paystubs[self._key(week_end)], 'actual_paystubs')
+
+        # Records are served from the database from now on
+        self.timesheets = {}
+        self.paystubs = {}
+        self.actual_paystubs = {}
+
+    def _write_employee(self):
+        """Insert or replace the employee row"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO employees (employee_id, record) VALUES (?, ?)",
+            (self.employee_id, json.dumps(self.employee))
+        )
+
+    def _write_timesheet(self, timesheet_data):
+        """Insert or replace a timesheet and its daily entries"""
+        week_end = timesheet_data['week_end']
+        self.connection.execute(
+            "INSERT OR REPLACE INTO timesheets (employee_id, week_end) VALUES (?, ?)",
+            (self.employee_id, week_end)
+        )
+        self.connection.execute(
+            "DELETE FROM timesheet_entries WHERE employee_id = ? AND week_end = ?",
+            (self.employee_id, week_end)
+        )
+        self.connection.executemany(
+            "INSERT INTO timesheet_entries (employee_id, week_end, position, day, time_in, "
+            "time_out, is_holiday, vacation_hours, sick_hours) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    self.employee_id, week_end, position, day,
+                    entry['time_in'], entry['time_out'],
+                    int(entry.get('is_holiday', False)),
+                    entry.get('vacation_hours', '0'), entry.get('sick_hours', '0')
+                )
+                for position, (day, entry) in enumerate(timesheet_data['entries'].items())
+            ]
+        )
+
+    def _write_paystub(self, paystub_data, table='paystubs'):
+        """Insert or replace a row of the paystubs or actual_paystubs table"""
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {table} (employee_id, week_end, record) VALUES (?, ?, ?)",
+            (self.employee_id, paystub_data['week_end'], json.dumps(paystub_data))
+        )
+
+    def _week_ends(self, collection):
+        """Get the week end dates of this employee's rows in a table"""
+        return [row[0] for row in self.connection.execute(
+            f"SELECT week_end FROM {collection} WHERE employee_id = ?", (self.employee_id,)
+        )]
+
+    def _range_condition(self, date_from=None, date_to=None):
+        """Get the WHERE condition and parameters for a week end date range"""
+        condition = "employee_id = ?"
+        params = [self.employee_id]
+        if date_from:
+            condition += " AND week_end >= ?"
+            params.append(date_from)
+        if date_to:
+            condition += " AND week_end <= ?"
+            params.append(date_to)
+        return condition, params
+
+    def _read_timesheets(self, week_end=None, date_from=None, date_to=None):
+        """Build timesheet dicts from the entry rows, for one week or a range"""
+        if week_end is not None:
+            date_from = date_to = week_end
+        condition, params = self._range_condition(date_from, date_to)
+        query = ("SELECT week_end, day, time_in, time_out, is_holiday, vacation_hours, sick_hours "
+                 f"FROM timesheet_entries WHERE {condition} ORDER BY week_end, position")
+
+        timesheets = {}
+        for row in self.connection.execute(query, params):
+            timesheet = timesheets.setdefault(row[0], {'week_end': row[0], 'entries': {}})
+            timesheet['entries'][row[1]] = {
+                'time_in': row[2],
+                'time_out': row[3],
+                'is_holiday': bool(row[4]),
+                'vacation_hours': row[5],
+                'sick_hours': row[6]
+            }
+        return list(timesheets.values())
+
+    def _save_data(self):
+        """Save the employee record. Records are written as they change."""
+        self._save_employee()
+
+    def _save_employee(self):
+        """Save employee data to the database."""
+        try:
+            with self.connection:
+                self._write_employee()
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    # Timesheet operations
+    def add_timesheet(self, timesheet_data):
+        """Add or update timesheet"""
+        try:
+            with self.connection:
+                self._write_timesheet(timesheet_data)
+            self._index_records('timesheets', [timesheet_data])
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def add_timesheets(self, timesheets):
+        """Add or update several timesheets in one transaction, raising on failure"""
+        with self.connection:
+            for timesheet_data in timesheets:
+                self._write_timesheet(timesheet_data)
+        self._index_records('timesheets', timesheets)
+
+    def get_timesheet(self, week_end):
+        """Get timesheet by week start date"""
+        timesheets = self._read_timesheets(week_end)
+        return timesheets[0] if timesheets else None
+
+    def delete_timesheet(self, week_end):
+        """Delete timesheet"""
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM timesheets WHERE employee_id = ? AND week_end = ?",
+                (self.employee_id, week_end)
+            ).rowcount
+            self.connection.execute(
+                "DELETE FROM timesheet_entries WHERE employee_id = ? AND week_end = ?",
+                (self.employee_id, week_end)
+            )
+        self._unindex_record('timesheets', week_end)
+        return deleted > 0
+
+    def get_parsed_timesheet(self, week_end):
+        """Get a week's timesheet as a Timesheet record for the calculators"""
+        timesheet = self.get_timesheet(week_end)
+        return Timesheet.from_dict(timesheet) if timesheet else None
+
+    def get_timesheets(self, date_from=None, date_to=None):
+        """Get all timesheets, or those in a week end date range, in week order"""
+        return self._read_timesheets(date_from=date_from, date_to=date_to)
+
+    def get_parsed_timesheets(self, date_from=None, date_to=None):
+        """Get timesheets as Timesheet records, parsed once per query"""
+        return [Timesheet.from_dict(timesheet) for timesheet in self.get_timesheets(date_from, date_to)]
+
+    # Paystub operations
+    def add_paystub(self, paystub_data):
+        """Add or update paystub"""
+        try:
+            with self.connection:
+                self._write_paystub(paystub_data)
+            self._index_records('paystubs', [paystub_data])
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def add_paystubs(self, paystubs):
+        """Add or update several paystubs in one transaction, raising on failure"""
+        with self.connection:
+            for paystub_data in paystubs:
+                self._write_paystub(paystub_data)
+        self._index_records('paystubs', paystubs)
+
+    def get_paystub(self, week_end):
+        """Get paystub by week start date"""
+        row = self.connection.execute(
+            "SELECT record FROM paystubs WHERE employee_id = ? AND week_end = ?",
+            (self.employee_id, week_end)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_paystub(self, week_end):
+        """Delete paystub"""
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM paystubs WHERE employee_id = ? AND week_end = ?",
+                (self.employee_id, week_end)
+            ).rowcount
+        self._unindex_record('paystubs', week_end)
+        return deleted > 0
+
+    def _read_records(self, table, date_from=None, date_to=None):
+        """Load the JSON records of a table in week order"""
+        condition, params = self._range_condition(date_from, date_to)
+        return [
+            json.loads(row[0]) for row in self.connection.execute(
+                f"SELECT record FROM {table} WHERE {condition} ORDER BY week_end", params
+            )
+        ]
+
+    def get_paystubs(self, date_from=None, date_to=None):
+        """Get all paystubs, or those in a week end date range, in week order"""
+        return self._read_records('paystubs', date_from, date_to)
+
+    # Actual paystub operations
+    def add_actual_paystub(self, paystub_data):
+        """Add or update an employer-issued paystub"""
+        try:
+            with self.connection:
+                self._write_paystub(paystub_data, 'actual_paystubs')
+            self._index_records('actual_paystubs', [paystub_data])
+        except Exception as e:
+            print(f"Error saving data: {str(e)}")
+
+    def add_actual_paystubs(self, paystubs):
+        """Add or update several employer-issued paystubs in one transaction, raising on failure"""
+        with self.connection:
+            for paystub_data in paystubs:
+                self._write_paystub(paystub_data, 'actual_paystubs')
+        self._index_records('actual_paystubs', paystubs)
+
+    def get_actual_paystub(self, week_end):
+        """Get the employer-issued paystub for a week"""
+        row = self.connection.execute(
+            "SELECT record FROM actual_paystubs WHERE employee_id = ? AND week_end = ?",
+            (self.employee_id, week_end)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_actual_paystub(self, week_end):
+        """Delete an employer-issued paystub"""
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM actual_paystubs WHERE employee_id = ? AND week_end = ?",
+                (self.employee_id, week_end)
+            ).rowcount
+        self._unindex_record('actual_paystubs', week_end)
+        return deleted > 0
+
+    def get_actual_paystubs(self, date_from=None, date_to=None):
+        """Get all employer-issued paystubs, or those in a week end date range"""
+        return self._read_records('actual_paystubs', date_from, date_to)
+
+    def close(self):
+        """Close the database connection"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
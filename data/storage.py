@@ -0,0 +1,31 @@
+import os
+from importlib import import_module
+
+# Available storage modes, as (module, class) pairs so that only the
+# selected backend is imported. "json" keeps the original three-file
+# layout, "records" stores each timesheet and paystub in its own file,
+# "lazy" uses the same files but only parses records when they are used,
+# "journal" appends changes to a write-ahead log compacted into the JSON
+# files and "sqlite" keeps everything in an indexed SQLite database.
+STORAGE_MODES = {
+    'json': ('.data_manager', 'DataManager'),
+    'records': ('.record_data_manager', 'RecordDataManager'),
+    'lazy': ('.lazy_record_data_manager', 'LazyRecordDataManager'),
+    'journal': ('.journal_data_manager', 'JournalDataManager'),
+    'sqlite': ('.sqlite_data_manager', 'SQLiteDataManager')
+}
+
+DEFAULT_STORAGE = 'json'
+
+def open_data_manager(storage=None, data_dir='data', employee_id='Employee'):
+    """Create a DataManager for the requested storage mode.
+
+    When no mode is given, the PAYSTUB_STORAGE environment variable is used,
+    falling back to the original JSON layout.
+    """
+    storage = storage or os.environ.get('PAYSTUB_STORAGE', DEFAULT_STORAGE)
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {storage}")
+    module_name, class_name = STORAGE_MODES[storage]
+    storage_class = getattr(import_module(module_name, __package__), class_name)
+    return storage_class(data_dir, employee_id)
@@ -0,0 +1,65 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+class WeekIndex:
+    """Sorted week end dates of one record collection
+
+    Dates are YYYY-MM-DD strings, so string order is date order and every
+    lookup is a binary search. Range queries return week end dates; the
+    records themselves are fetched only for the weeks that are needed.
+    """
+    def __init__(self, week_ends=()):
+        self.weeks = sorted(set(week_ends))
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def __iter__(self):
+        return iter(self.weeks)
+
+    def __contains__(self, week_end):
+        index = bisect_left(self.weeks, week_end)
+        return index < len(self.weeks) and self.weeks[index] == week_end
+
+    def add(self, week_end):
+        """Add a week if it is not indexed yet"""
+        if week_end not in self:
+            insort(self.weeks, week_end)
+
+    def remove(self, week_end):
+        """Remove a week if it is indexed"""
+        index = bisect_left(self.weeks, week_end)
+        if index < len(self.weeks) and self.weeks[index] == week_end:
+            del self.weeks[index]
+
+    def between(self, date_from=None, date_to=None):
+        """Get the weeks from date_from through date_to, oldest first"""
+        start = bisect_left(self.weeks, date_from) if date_from else 0
+        end = bisect_right(self.weeks, date_to) if date_to else len(self.weeks)
+        return self.weeks[start:end]
+
+    def latest(self, count=1):
+        """Get the most recent weeks, newest first"""
+        if count <= 0:
+            return []
+        return self.weeks[:-count - 1:-1]
+
+    def nearest(self, week_end):
+        """Get the indexed week closest to a date, the earlier one on a tie
+
+        Returns None when the index is empty.
+        """
+        if not self.weeks:
+            return None
+        index = bisect_left(self.weeks, week_end)
+        if index == len(self.weeks):
+            return self.weeks[-1]
+        if index == 0 or self.weeks[index] == week_end:
+            return self.weeks[index]
+        before = self.weeks[index - 1]
+        after = self.weeks[index]
+        # Dates are compared as days apart, not as strings
+        target = date.fromisoformat(week_end)
+        if target - date.fromisoformat(before) <= date.fromisoformat(after) - target:
+            return before
+        return after
@@ -0,0 +1,125 @@
+from bisect import bisect_left, bisect_right
+from money import HOUR_UNITS, to_cents, to_dollars, to_hour_units
+
+# Paystub sections summed year to date
+SECTIONS = ['hours', 'wages', 'pay', 'pre_tax_deductions', 'post_tax_deductions', 'additions']
+
+def paystub_lines(paystub):
+    """Flatten a paystub into {(section, name): whole units}
+
+    Hours are counted in hour units and amounts in cents, so running sums
+    are exact integers.
+    """
+    lines = {}
+    for section in SECTIONS:
+        for name, value in (paystub.get(section) or {}).items():
+            if section == 'hours':
+                lines[(section, name)] = to_hour_units(float(value))
+            else:
+                lines[(section, name)] = to_cents(value)
+    return lines
+
+class YearTotals:
+    """Paystub lines of one calendar year, in week order, with prefix sums
+
+    totals[i] holds the sums of lines[0..i]. Totals are computed when they
+    are asked for and dropped from the first changed week on, so adding
+    the latest week only extends the sums.
+    """
+    __slots__ = ('weeks', 'lines', 'totals')
+
+    def __init__(self):
+        self.weeks = []
+        self.lines = []
+        self.totals = []
+
+    def set_week(self, week_end, lines):
+        """Add or replace the lines of a week"""
+        index = bisect_left(self.weeks, week_end)
+        if index < len(self.weeks) and self.weeks[index] == week_end:
+            self.lines[index] = lines
+        else:
+            self.weeks.insert(index, week_end)
+            self.lines.insert(index, lines)
+        del self.totals[index:]
+
+    def remove_week(self, week_end):
+        """Remove a week, returning whether it was indexed"""
+        index = bisect_left(self.weeks, week_end)
+        if index < len(self.weeks) and self.weeks[index] == week_end:
+            del self.weeks[index]
+            del self.lines[index]
+            del self.totals[index:]
+            return True
+        return False
+
+    def total_through(self, week_end):
+        """Get the summed lines of every week up to and including week_end"""
+        count = bisect_right(self.weeks, week_end)
+        if count == 0:
+            return {}
+        while len(self.totals) < count:
+            index = len(self.totals)
+            total = dict(self.totals[-1]) if self.totals else {}
+            for key, value in self.lines[index].items():
+                total[key] = total.get(key, 0) + value
+            self.totals.append(total)
+        return self.totals[count - 1]
+
+class YTDIndex:
+    """Year-to-date totals of one employee's paystubs
+
+    Paystubs are grouped by the calendar year of their week end date and
+    kept sorted by week within each year. Looking up the year to date
+    totals for a week is a binary search into the year's prefix sums.
+
+    With load_year, each year is built the first time it is looked up from
+    load_year(year), which returns that year's stored paystubs, so other
+    years are never read. Changes to a year that is not loaded yet are
+    skipped; they are in storage when the year is loaded.
+    """
+    def __init__(self, paystubs=(), load_year=None):
+        self.years = {}
+        self.load_year = load_year
+        for paystub in paystubs:
+            self._add_lines(self.years.setdefault(paystub['week_end'][:4], YearTotals()), paystub)
+
+    def _add_lines(self, year, paystub):
+        year.set_week(paystub['week_end'], paystub_lines(paystub))
+
+    def _year(self, year):
+        """Get the totals of a year, loading them on first use"""
+        if year not in self.years and self.load_year is not None:
+            totals = YearTotals()
+            for paystub in self.load_year(year):
+                self._add_lines(totals, paystub)
+            self.years[year] = totals
+        return self.years.get(year)
+
+    def add(self, paystub):
+        """Add or replace a paystub"""
+        year = paystub['week_end'][:4]
+        if year in self.years:
+            self._add_lines(self.years[year], paystub)
+        elif self.load_year is None:
+            self._add_lines(self.years.setdefault(year, YearTotals()), paystub)
+
+    def remove(self, week_end):
+        """Remove the paystub of a week"""
+        year = self.years.get(week_end[:4])
+        if year is not None:
+            year.remove_week(week_end)
+
+    def get_ytd(self, week_end):
+        """Get year to date totals through a week, laid out like a paystub
+
+        Returns: dict of sections keyed by wage category or deduction code,
+                 with hours and dollar amounts
+        """
+        ytd = {section: {} for section in SECTIONS}
+        year = self._year(week_end[:4])
+        if year is None:
+            return ytd
+        for (section, name), value in year.total_through(week_end).items():
+            ytd[section][name] = value / HOUR_UNITS if section == 'hours' else to_dollars(value)
+        return ytd
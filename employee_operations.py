@@ -253,8 +253,7 @@ class EmployeeOperations:
             employee_data = merged_data
         
         # Save the employee data
-        self.data_manager.employee = employee_data
-        self.data_manager._save_data()
+        self.data_manager.update_employee(employee_data)
         return True, []
 
     def add_deduction(self, employee_data, deduction_type, deduction_data):
@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from .base_form import BaseForm
+from .week_list import WeekList
+from .record_view import GridRows
 from ..gui_utils import center_elements
 
 class GeneratePaystubForm(BaseForm):
@@ -32,21 +34,18 @@ class GeneratePaystubForm(BaseForm):
         select_frame = ttk.LabelFrame(container, text="Select Timesheet", padding="10")
         select_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
 
-        timesheet_listbox = tk.Listbox(select_frame, width=50, height=5)
-        timesheet_listbox.grid(row=0, column=0, padx=5, pady=5)
-
         # Load timesheets
-        timesheets = self.data_manager.get_timesheets()
-        for timesheet in timesheets:
-            timesheet_listbox.insert(tk.END, timesheet['week_end'])
+        timesheet_list = WeekList(
+            select_frame,
+            self.data_manager.week_index('timesheets')
+        )
+        timesheet_list.grid(row=0, column=0, padx=5, pady=5)
 
         def generate_paystub():
-            selection = timesheet_listbox.curselection()
-            if not selection:
+            week_end = timesheet_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a timesheet to generate paystub")
                 return
-
-            week_end = timesheet_listbox.get(selection[0])
             
             try:
                 # Get the full timesheet object
@@ -145,32 +144,24 @@ class DisplayPaystubForm(BaseForm):
         paystub_frame.grid_columnconfigure(0, weight=1)
         paystub_frame.grid_rowconfigure(0, weight=1)
 
-        # Create listbox for paystubs
-        paystub_listbox = tk.Listbox(paystub_frame, height=5)  # Reduced height
-        paystub_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
-        
-        # Add scrollbar to listbox
-        listbox_scrollbar = ttk.Scrollbar(paystub_frame, orient="vertical", command=paystub_listbox.yview)
-        listbox_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        paystub_listbox.configure(yscrollcommand=listbox_scrollbar.set)
-
         # Populate paystub list
-        success, result = self.paystub_ops.get_employee_paystubs()
-        if success:
-            for paystub in result:
-                paystub_listbox.insert(tk.END, paystub['week_end'])
+        paystub_list = WeekList(
+            paystub_frame,
+            self.data_manager.week_index('paystubs'),
+            on_activate=lambda: display_paystub()
+        )
+        paystub_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
 
         # Create details frame for paystub details
+        self.wage_rows = None
         self.details_frame = ttk.Frame(scrollable_frame)
         self.details_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=10)
 
         def display_paystub():
-            selection = paystub_listbox.curselection()
-            if not selection:
+            week_end = paystub_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a paystub to display")
                 return
-
-            week_end = paystub_listbox.get(selection[0])
             
             try:
                 success, result = self.paystub_ops.get_paystub_details(week_end)
@@ -199,12 +190,8 @@ class DisplayPaystubForm(BaseForm):
         y = (self.form_window.winfo_screenheight() // 2) - (height // 2)
         self.form_window.geometry(f'+{x}+{y}')
 
-    def display_paystub(self, paystub):
-        """Display paystub details"""
-        # Clear previous display
-        for widget in self.details_frame.winfo_children():
-            widget.destroy()
-
+    def create_details_view(self):
+        """Create the paystub detail widgets, filled in by display_paystub"""
         # Create two main rows
         top_row = ttk.Frame(self.details_frame)
         top_row.pack(fill=tk.X, padx=5, pady=5)
@@ -224,41 +211,62 @@ class DisplayPaystubForm(BaseForm):
         # Headers
         ttk.Label(grid_frame, text="Hours", font=('Helvetica', 10, 'bold')).grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
         ttk.Label(grid_frame, text="Wages", font=('Helvetica', 10, 'bold')).grid(row=0, column=1, padx=5, pady=2, sticky=tk.W)
-
-        # Display hours and wages side by side
-        for i, (category, hours) in enumerate(paystub['hours'].items(), start=1):
-            ttk.Label(grid_frame, text=f"{category}: {hours:.2f}").grid(row=i, column=0, padx=5, pady=1, sticky=tk.W)
-            ttk.Label(grid_frame, text=f"${paystub['wages'][category]:.2f}").grid(row=i, column=1, padx=5, pady=1, sticky=tk.W)
+        ttk.Label(grid_frame, text="YTD Wages", font=('Helvetica', 10, 'bold')).grid(row=0, column=2, padx=5, pady=2, sticky=tk.W)
+        self.wage_rows = GridRows(grid_frame, first_row=1, padx=5, pady=1, sticky=tk.W)
 
         # Pay section
         pay_frame = ttk.LabelFrame(top_row, text="Pay Summary", padding="5")
         pay_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
 
-        ttk.Label(pay_frame, text=f"Gross Pay: ${paystub['pay']['gross']:.2f}").pack(anchor=tk.W)
-        ttk.Label(pay_frame, text=f"Adjusted Gross: ${paystub['pay']['adjusted_gross']:.2f}").pack(anchor=tk.W)
-        ttk.Label(pay_frame, text=f"Net Pay: ${paystub['pay']['net']:.2f}").pack(anchor=tk.W)
+        self.pay_vars = {}
+        for field in ['gross', 'adjusted_gross', 'net']:
+            self.pay_vars[field] = tk.StringVar()
+            ttk.Label(pay_frame, textvariable=self.pay_vars[field]).pack(anchor=tk.W)
 
         # Bottom row: Additions, Pre-tax Deductions, and Post-tax Deductions
-        # Additions section
-        additions_frame = ttk.LabelFrame(bottom_row, text="Additions", padding="5")
-        additions_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        self.amount_rows = {}
+        for section, text in [
+            ('additions', "Additions"),
+            ('pre_tax_deductions', "Pre-tax Deductions"),
+            ('post_tax_deductions', "Post-tax Deductions")
+        ]:
+            section_frame = ttk.LabelFrame(bottom_row, text=text, padding="5")
+            section_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+            self.amount_rows[section] = GridRows(section_frame, sticky=tk.W)
 
-        for addition_id, amount in paystub['additions'].items():
-            ttk.Label(additions_frame, text=f"{addition_id}: ${amount:.2f}").pack(anchor=tk.W)
-
-        # Pre-tax Deductions section
-        pre_tax_frame = ttk.LabelFrame(bottom_row, text="Pre-tax Deductions", padding="5")
-        pre_tax_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+    def display_paystub(self, paystub):
+        """Display paystub details"""
+        # The detail widgets are created once and updated for each paystub
+        if self.wage_rows is None:
+            self.create_details_view()
 
-        for deduction_id, amount in paystub['pre_tax_deductions'].items():
-            ttk.Label(pre_tax_frame, text=f"{deduction_id}: ${amount:.2f}").pack(anchor=tk.W)
+        # Year to date totals through this week, from the YTD index
+        success, ytd = self.paystub_ops.get_paystub_ytd(paystub['week_end'])
+        if not success:
+            ytd = {}
 
-        # Post-tax Deductions section
-        post_tax_frame = ttk.LabelFrame(bottom_row, text="Post-tax Deductions", padding="5")
-        post_tax_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        def ytd_text(section, name):
+            amount = ytd.get(section, {}).get(name)
+            return "" if amount is None else f"YTD ${amount:.2f}"
 
-        for deduction_id, amount in paystub['post_tax_deductions'].items():
-            ttk.Label(post_tax_frame, text=f"{deduction_id}: ${amount:.2f}").pack(anchor=tk.W)
+        # Display hours and wages side by side
+        self.wage_rows.update({
+            category: [
+                f"{category}: {hours:.2f}",
+                f"${paystub['wages'][category]:.2f}",
+                ytd_text('wages', category)
+            ]
+            for category, hours in paystub['hours'].items()
+        })
+
+        for field, label in [('gross', "Gross Pay"), ('adjusted_gross', "Adjusted Gross"), ('net', "Net Pay")]:
+            self.pay_vars[field].set(f"{label}: ${paystub['pay'][field]:.2f}  {ytd_text('pay', field)}")
+
+        for section, rows in self.amount_rows.items():
+            rows.update({
+                name: [f"{name}: ${amount:.2f}", ytd_text(section, name)]
+                for name, amount in paystub[section].items()
+            })
 
 class PrintPaystubForm(DisplayPaystubForm):
     def create_form(self):
@@ -339,28 +347,19 @@ class DeletePaystubForm(BaseForm):
         paystub_frame.grid_columnconfigure(0, weight=1)
         paystub_frame.grid_rowconfigure(0, weight=1)
 
-        # Create listbox for paystubs
-        paystub_listbox = tk.Listbox(paystub_frame, height=8)
-        paystub_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
-        
-        # Add scrollbar to listbox
-        listbox_scrollbar = ttk.Scrollbar(paystub_frame, orient="vertical", command=paystub_listbox.yview)
-        listbox_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        paystub_listbox.configure(yscrollcommand=listbox_scrollbar.set)
-
         # Populate paystub list
-        success, result = self.paystub_ops.get_employee_paystubs()
-        if success:
-            for paystub in result:
-                paystub_listbox.insert(tk.END, paystub['week_end'])
+        paystub_list = WeekList(
+            paystub_frame,
+            self.data_manager.week_index('paystubs'),
+            height=8
+        )
+        paystub_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
 
         def delete_paystub():
-            selection = paystub_listbox.curselection()
-            if not selection:
+            week_end = paystub_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a paystub to delete")
                 return
-
-            week_end = paystub_listbox.get(selection[0])
             
             # Confirm deletion
             confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the paystub for {week_end}?")
@@ -371,12 +370,8 @@ class DeletePaystubForm(BaseForm):
                 success, result = self.paystub_ops.delete_paystub(week_end)
                 if success:
                     messagebox.showinfo("Success", result)
-                    # Refresh the listbox
-                    paystub_listbox.delete(0, tk.END)
-                    success, refreshed_paystubs = self.paystub_ops.get_employee_paystubs()
-                    if success:
-                        for paystub in refreshed_paystubs:
-                            paystub_listbox.insert(tk.END, paystub['week_end'])
+                    # Refresh the list
+                    paystub_list.remove(week_end)
                 else:
                     messagebox.showerror("Error", result)
 
@@ -397,3 +392,291 @@ class DeletePaystubForm(BaseForm):
         x = (self.form_window.winfo_screenwidth() // 2) - (width // 2)
         y = (self.form_window.winfo_screenheight() // 2) - (height // 2)
         self.form_window.geometry(f'+{x}+{y}')
+
+class ComparePaystubForm(BaseForm):
+    def __init__(self, main_app):
+        super().__init__(main_app)
+        self.data_manager = main_app.data_manager
+        self.paystub_ops = main_app.paystub_ops
+        self.form_window = None
+
+    def create_form(self):
+        """Create the compare paystub form"""
+        self.form_window.title("Compare Paystub")
+
+        container = ttk.Frame(self.form_window, padding="10")
+        container.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        container.grid_columnconfigure(0, weight=1)
+
+        # Title
+        title = ttk.Label(
+            container,
+            text="COMPARE PAYSTUB",
+            font=('Helvetica', 16, 'bold')
+        )
+        title.grid(row=0, column=0, pady=20)
+
+        # Weeks with an employer-issued paystub
+        actual_frame = ttk.LabelFrame(container, text="Select Actual Paystub", padding="10")
+        actual_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+        actual_frame.grid_columnconfigure(0, weight=1)
+
+        actual_list = WeekList(
+            actual_frame,
+            self.data_manager.week_index('actual_paystubs'),
+            on_activate=lambda: compare_paystub()
+        )
+        actual_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+
+        # Side by side lines, filled in on each comparison
+        results_frame = ttk.LabelFrame(container, text="Calculated vs Actual", padding="10")
+        results_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+        for column, text in enumerate(["Line", "Calculated", "Actual", "Difference", ""]):
+            ttk.Label(results_frame, text=text, font=('Helvetica', 10, 'bold')).grid(
+                row=0, column=column, padx=5, pady=2, sticky=tk.W
+            )
+        line_rows = GridRows(results_frame, first_row=1, padx=5, pady=1, sticky=tk.W)
+
+        status_var = tk.StringVar()
+        ttk.Label(container, textvariable=status_var).grid(row=3, column=0, pady=5)
+
+        def compare_paystub():
+            week_end = actual_list.get_selected()
+            if not week_end:
+                messagebox.showwarning("Warning", "Please select an actual paystub to compare")
+                return
+
+            success, report = self.paystub_ops.compare_paystub(week_end)
+            if not success:
+                messagebox.showerror("Error", report)
+                return
+
+            line_rows.update({
+                (line['section'], line['name']): [
+                    f"YTD {line['name']}" if line['section'].startswith('ytd_') else line['name'],
+                    f"{line['computed']:.2f}",
+                    f"{line['actual']:.2f}",
+                    # Adding 0.0 shows -0.00 rounding noise as +0.00
+                    f"{round(line['difference'], 2) + 0.0:+.2f}",
+                    "OK" if line['matches'] else "DIFFERS"
+                ]
+                for line in report['lines']
+            })
+            status_var.set(f"{week_end}: {report['message']}")
+            self.auto_size_window()
+
+        # Buttons
+        button_frame = ttk.Frame(container)
+        button_frame.grid(row=4, column=0, pady=20)
+
+        ttk.Button(button_frame, text="Compare", command=compare_paystub, width=15).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="Close", command=self._on_close, width=15).grid(row=0, column=1, padx=5)
+
+        self.auto_size_window()
+
+class EnterActualPaystubForm(BaseForm):
+    """Entry form for an employer-issued paystub, laid out like a paystub
+
+    Each line has a current and a year to date amount. Lines left blank
+    are not on the paper stub and are not saved, so they are not compared.
+    """
+    SECTION_TITLES = [
+        ('hours', "Hours"),
+        ('wages', "Wages"),
+        ('pay', "Pay Summary"),
+        ('pre_tax_deductions', "Pre-tax Deductions"),
+        ('post_tax_deductions', "Post-tax Deductions"),
+        ('additions', "Additions")
+    ]
+    PAY_LABELS = {'gross': "Gross Pay", 'adjusted_gross': "Adjusted Gross", 'net': "Net Pay"}
+
+    def __init__(self, main_app):
+        super().__init__(main_app)
+        self.data_manager = main_app.data_manager
+        self.paystub_ops = main_app.paystub_ops
+        self.form_window = None
+        self.layout = None
+        self.line_entries = {}
+
+    def create_form(self):
+        """Create the enter actual paystub form"""
+        self.form_window.title("Enter Actual Paystub")
+
+        container = ttk.Frame(self.form_window, padding="10")
+        container.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        container.grid_columnconfigure(0, weight=1)
+
+        # Title
+        title = ttk.Label(
+            container,
+            text="ENTER ACTUAL PAYSTUB",
+            font=('Helvetica', 16, 'bold')
+        )
+        title.grid(row=0, column=0, pady=20)
+
+        # Week end date frame, starting at the latest timesheet
+        date_frame = ttk.LabelFrame(container, text="Week End Date", padding="10")
+        date_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+
+        ttk.Label(date_frame, text="Date (YYYY-MM-DD):").grid(row=0, column=0, padx=5)
+        self.week_end_entry = ttk.Entry(date_frame)
+        self.week_end_entry.grid(row=0, column=1, padx=5)
+        latest = self.data_manager.week_index('timesheets').latest(1)
+        if latest:
+            self.week_end_entry.insert(0, latest[0])
+        ttk.Button(date_frame, text="Load Lines", command=self.load_lines, width=15).grid(row=0, column=2, padx=5)
+
+        # Paystub lines, laid out for the week by load_lines
+        self.lines_frame = ttk.LabelFrame(container, text="Paystub Lines", padding="10")
+        self.lines_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+
+        # Lines printed on the stub that are not in the layout
+        extra_frame = ttk.LabelFrame(container, text="Other Line", padding="10")
+        extra_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+        ttk.Label(extra_frame, text="Section:").grid(row=0, column=0, padx=5)
+        self.extra_section = ttk.Combobox(
+            extra_frame, values=[title for section, title in self.SECTION_TITLES], state='readonly', width=20
+        )
+        self.extra_section.current(4)
+        self.extra_section.grid(row=0, column=1, padx=5)
+        ttk.Label(extra_frame, text="Name:").grid(row=0, column=2, padx=5)
+        self.extra_name = ttk.Entry(extra_frame, width=12)
+        self.extra_name.grid(row=0, column=3, padx=5)
+        ttk.Button(extra_frame, text="Add Line", command=self.add_line, width=12).grid(row=0, column=4, padx=5)
+
+        # Buttons
+        button_frame = ttk.Frame(container)
+        button_frame.grid(row=4, column=0, pady=20)
+
+        ttk.Button(button_frame, text="Save", command=self.save_paystub, width=15).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self._on_close, width=15).grid(row=0, column=1, padx=5)
+
+        if latest:
+            self.load_lines()
+        self.auto_size_window()
+
+    def _week_end(self):
+        """Get the entered week end date, or None after warning about it"""
+        week_end = self.week_end_entry.get().strip()
+        try:
+            datetime.strptime(week_end, "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+            return None
+        return week_end
+
+    def load_lines(self):
+        """Lay out the lines of the week, filled in from a saved actual paystub"""
+        week_end = self._week_end()
+        if not week_end:
+            return
+
+        success, layout = self.paystub_ops.get_paystub_layout(week_end)
+        if not success:
+            messagebox.showerror("Error", layout)
+            return
+
+        actual = self.data_manager.get_actual_paystub(week_end) or {}
+        ytd = actual.get('ytd') or {}
+        values = {
+            (section, name): (
+                (actual.get(section) or {}).get(name, ''),
+                (ytd.get(section) or {}).get(name, '')
+            )
+            for section in layout for name in layout[section]
+        }
+        self.layout = layout
+        self.build_lines(values)
+
+    def build_lines(self, values):
+        """Create an entry row per line, with the given (current, ytd) values"""
+        for widget in self.lines_frame.winfo_children():
+            widget.destroy()
+        self.line_entries = {}
+
+        for column, text in enumerate(["Line", "Current", "Year to Date"]):
+            ttk.Label(self.lines_frame, text=text, font=('Helvetica', 10, 'bold')).grid(
+                row=0, column=column, padx=5, pady=2, sticky=tk.W
+            )
+
+        row = 1
+        for section, title in self.SECTION_TITLES:
+            if not self.layout[section]:
+                continue
+            ttk.Label(self.lines_frame, text=title, font=('Helvetica', 10, 'bold')).grid(
+                row=row, column=0, padx=5, pady=(8, 2), sticky=tk.W
+            )
+            row += 1
+            for name in self.layout[section]:
+                label = self.PAY_LABELS.get(name, name) if section == 'pay' else name
+                ttk.Label(self.lines_frame, text=label).grid(row=row, column=0, padx=15, pady=1, sticky=tk.W)
+                entries = []
+                for column, value in enumerate(values.get((section, name), ('', '')), 1):
+                    entry = ttk.Entry(self.lines_frame, width=12)
+                    entry.grid(row=row, column=column, padx=5, pady=1)
+                    if value != '':
+                        entry.insert(0, str(value))
+                    entries.append(entry)
+                self.line_entries[(section, name)] = entries
+                row += 1
+        self.auto_size_window()
+
+    def add_line(self):
+        """Add a line the employer printed that the layout doesn't have"""
+        if self.layout is None:
+            messagebox.showwarning("Warning", "Please load the lines of a week first")
+            return
+        name = self.extra_name.get().strip()
+        if not name:
+            messagebox.showwarning("Warning", "Please enter the line name as printed on the paystub")
+            return
+        section = self.SECTION_TITLES[self.extra_section.current()][0]
+        if name in self.layout[section]:
+            messagebox.showwarning("Warning", f"{name} is already listed")
+            return
+
+        # Keep what has been typed while the rows are laid out again
+        values = {key: tuple(entry.get() for entry in entries) for key, entries in self.line_entries.items()}
+        self.layout[section].append(name)
+        self.build_lines(values)
+        self.extra_name.delete(0, tk.END)
+
+    def _amount(self, text):
+        """Read an amount as printed, e.g. "$1,234.56"; bad text is kept for validation to report"""
+        try:
+            return float(text.replace('$', '').replace(',', ''))
+        except ValueError:
+            return text
+
+    def save_paystub(self):
+        """Save the entered lines as the actual paystub of the week"""
+        week_end = self._week_end()
+        if not week_end:
+            return
+        if self.layout is None:
+            messagebox.showwarning("Warning", "Please load the lines of a week first")
+            return
+
+        paystub_data = {'week_end': week_end}
+        ytd = {}
+        for (section, name), (current_entry, ytd_entry) in self.line_entries.items():
+            current = current_entry.get().strip()
+            if current:
+                paystub_data.setdefault(section, {})[name] = self._amount(current)
+            ytd_amount = ytd_entry.get().strip()
+            if ytd_amount:
+                ytd.setdefault(section, {})[name] = self._amount(ytd_amount)
+        if ytd:
+            paystub_data['ytd'] = ytd
+
+        if self.data_manager.get_actual_paystub(week_end) and not messagebox.askyesno(
+            "Confirm Replace", f"Replace the actual paystub already entered for {week_end}?"
+        ):
+            return
+
+        success, message = self.paystub_ops.add_actual_paystub(paystub_data)
+        if success:
+            messagebox.showinfo("Success", message)
+            self._on_close()
+        else:
+            messagebox.showerror("Error", message)
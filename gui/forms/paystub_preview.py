@@ -0,0 +1,154 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from calculate_hours import IncrementalWeeklyHours
+
+class PaystubPreview:
+    """Live gross/net preview for the timesheet forms
+
+    Field changes are debounced, then the entries are calculated on a
+    worker thread so typing never waits on the calculation. The worker
+    keeps an IncrementalWeeklyHours tracker so only edited days are
+    recalculated. Results are handed back through a queue that the Tk
+    main loop polls with after(), since Tk widgets may only be touched
+    from the main thread. Destroying the preview frame, directly or with
+    the window holding it, stops the worker and the polling.
+    """
+    DEBOUNCE_MS = 300
+    POLL_MS = 50
+
+    def __init__(self, parent, paystub_ops, collect_entries):
+        self.parent = parent
+        self.paystub_ops = paystub_ops
+        self.collect_entries = collect_entries
+
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+        self.generation = 0
+        self.pending_after = None
+        self.poll_after = None
+
+        self.hours_var = tk.StringVar(value="-")
+        self.gross_var = tk.StringVar(value="-")
+        self.net_var = tk.StringVar(value="-")
+        self.status_var = tk.StringVar(value="Enter times to see estimated pay")
+
+        self.frame = ttk.LabelFrame(parent, text="Paystub Preview", padding="10")
+        for row, (label, variable) in enumerate([
+            ("Total Hours:", self.hours_var),
+            ("Gross Pay:", self.gross_var),
+            ("Net Pay:", self.net_var)
+        ]):
+            ttk.Label(self.frame, text=label).grid(row=row, column=0, padx=5, sticky=tk.W)
+            ttk.Label(self.frame, textvariable=variable).grid(row=row, column=1, padx=5, sticky=tk.W)
+        ttk.Label(self.frame, textvariable=self.status_var, foreground="gray").grid(
+            row=3, column=0, columnspan=2, padx=5, pady=(5, 0), sticky=tk.W
+        )
+        self.frame.bind('<Destroy>', self._on_destroy)
+
+    def _on_destroy(self, event):
+        """Stop when the frame goes away, however its window was closed"""
+        if event.widget is self.frame:
+            self.close()
+
+    def watch(self, fields):
+        """Refresh the preview when any of a day's entry fields change"""
+        for field in fields.values():
+            if isinstance(field, tk.Variable):
+                field.trace_add('write', lambda *args: self.schedule())
+            else:
+                field.bind('<KeyRelease>', lambda event: self.schedule(), add='+')
+
+    def schedule(self):
+        """Restart the debounce timer"""
+        if self.pending_after is not None:
+            self.parent.after_cancel(self.pending_after)
+        self.pending_after = self.parent.after(self.DEBOUNCE_MS, self._submit)
+
+    def _submit(self):
+        """Hand the current entries to the worker thread"""
+        self.pending_after = None
+        try:
+            entries = self.collect_entries()
+        except tk.TclError:
+            return
+
+        self.generation += 1
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+        self.requests.put((self.generation, entries))
+        self.status_var.set("Calculating...")
+        if self.poll_after is None:
+            self.poll_after = self.parent.after(self.POLL_MS, self._poll)
+
+    def _run(self):
+        """Worker thread: calculate the latest request, skipping stale ones"""
+        tracker = None
+        while True:
+            request = self.requests.get()
+            while not self.requests.empty():
+                request = self.requests.get()
+            if request is None:
+                return
+
+            generation, entries = request
+            if tracker is None:
+                tracker = IncrementalWeeklyHours({'entries': entries})
+            else:
+                for day, entry in entries.items():
+                    if tracker.entries.get(day) != entry:
+                        tracker.update_day(day, entry)
+
+            try:
+                hours = tracker.get_hours()
+                timesheet = tracker.get_parsed_timesheet('')
+                success, result = self.paystub_ops.preview_paystub(timesheet, hours)
+            except ValueError as e:
+                success, result = False, str(e)
+            except Exception as e:
+                success, result = False, f"An error occurred: {str(e)}"
+            self.results.put((generation, success, result))
+
+    def _poll(self):
+        """Main thread: show the newest finished result"""
+        self.poll_after = None
+        latest = None
+        while not self.results.empty():
+            latest = self.results.get()
+
+        if latest is not None and latest[0] == self.generation:
+            self._show(latest[1], latest[2])
+        else:
+            # Still waiting on the newest request
+            self.poll_after = self.parent.after(self.POLL_MS, self._poll)
+
+    def _show(self, success, result):
+        """Update the preview labels"""
+        if not success:
+            self.hours_var.set("-")
+            self.gross_var.set("-")
+            self.net_var.set("-")
+            self.status_var.set(result)
+            return
+
+        self.hours_var.set(f"{sum(result['hours'].values()):.2f}")
+        self.gross_var.set(f"${result['pay']['gross']:.2f}")
+        self.net_var.set(f"${result['pay']['net']:.2f}")
+        self.status_var.set("Estimate only - save and generate a paystub to keep it")
+
+    def close(self):
+        """Cancel pending callbacks and stop the worker thread"""
+        for after_id in (self.pending_after, self.poll_after):
+            if after_id is not None:
+                try:
+                    self.parent.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+        self.pending_after = None
+        self.poll_after = None
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker = None
@@ -0,0 +1,38 @@
+import tkinter as tk
+from tkinter import ttk
+
+class GridRows:
+    """Rows of labels in a grid, updated in place when a new record is shown
+
+    Each row is keyed by name (a wage category, deduction or day) and its
+    labels show StringVars, so showing another record only sets text.
+    Labels are created the first time a key appears and hidden while a
+    record doesn't have that key. The grid is only laid out again when the
+    set or order of keys changes.
+    """
+    def __init__(self, parent, first_row=0, **grid_options):
+        self.parent = parent
+        self.first_row = first_row
+        self.grid_options = grid_options
+        self.rows = {}
+        self.layout = ()
+
+    def update(self, rows):
+        """Show rows given as {key: [column text, ...]}"""
+        for key, texts in rows.items():
+            if key not in self.rows:
+                variables = [tk.StringVar() for text in texts]
+                labels = [ttk.Label(self.parent, textvariable=variable) for variable in variables]
+                self.rows[key] = (labels, variables)
+            for variable, text in zip(self.rows[key][1], texts):
+                variable.set(text)
+
+        layout = tuple(rows)
+        if layout != self.layout:
+            for key in self.layout:
+                for label in self.rows[key][0]:
+                    label.grid_remove()
+            for index, key in enumerate(layout):
+                for column, label in enumerate(self.rows[key][0]):
+                    label.grid(row=self.first_row + index, column=column, **self.grid_options)
+            self.layout = layout
@@ -2,13 +2,30 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from .base_form import BaseForm
+from .paystub_preview import PaystubPreview
+from .week_list import WeekList
+from .record_view import GridRows
 from ..gui_utils import center_elements
 
+def collect_entries(daily_entries):
+    """Read the daily entries from the form fields of the timesheet forms"""
+    entries = {}
+    for day, fields in daily_entries.items():
+        entries[day] = {
+            'time_in': fields['time_in'].get().strip(),
+            'time_out': fields['time_out'].get().strip(),
+            'is_holiday': fields['is_holiday'].get(),
+            'vacation_hours': fields['vacation'].get().strip() or '0',
+            'sick_hours': fields['sick'].get().strip() or '0'
+        }
+    return entries
+
 class EnterTimesheetForm(BaseForm):
     def __init__(self, main_app):
         super().__init__(main_app)
         self.data_manager = main_app.data_manager
         self.timesheet_ops = main_app.timesheet_ops
+        self.preview = None
 
     def create_form(self):
         """Create the enter timesheet form"""
@@ -108,9 +125,16 @@ class EnterTimesheetForm(BaseForm):
                 'sick': sick
             }
 
+        # Live paystub preview
+        self.preview = PaystubPreview(scrollable_frame, self.main_app.paystub_ops,
+                                      lambda: collect_entries(daily_entries))
+        self.preview.frame.grid(row=3, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+        for fields in daily_entries.values():
+            self.preview.watch(fields)
+
         # Buttons
         button_frame = ttk.Frame(scrollable_frame)
-        button_frame.grid(row=3, column=0, pady=20)
+        button_frame.grid(row=4, column=0, pady=20)
 
         def save_timesheet():
             try:
@@ -127,15 +151,7 @@ class EnterTimesheetForm(BaseForm):
                     return
 
                 # Collect daily entries
-                entries = {}
-                for day, fields in daily_entries.items():
-                    entries[day] = {
-                        'time_in': fields['time_in'].get().strip(),
-                        'time_out': fields['time_out'].get().strip(),
-                        'is_holiday': fields['is_holiday'].get(),
-                        'vacation_hours': fields['vacation'].get().strip() or '0',
-                        'sick_hours': fields['sick'].get().strip() or '0'
-                    }
+                entries = collect_entries(daily_entries)
 
                 # Save timesheet
                 success, message = self.timesheet_ops.add_timesheet({
@@ -167,6 +183,7 @@ class EditTimesheetForm(BaseForm):
         super().__init__(main_app)
         self.data_manager = main_app.data_manager
         self.timesheet_ops = main_app.timesheet_ops
+        self.preview = None
 
     def create_form(self):
         """Create the edit timesheet form"""
@@ -224,13 +241,13 @@ class EditTimesheetForm(BaseForm):
         select_frame = ttk.LabelFrame(scrollable_frame, text="Select Timesheet", padding="10")
         select_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
 
-        timesheet_listbox = tk.Listbox(select_frame, width=50, height=5)
-        timesheet_listbox.grid(row=0, column=0, padx=5, pady=5)
-
         # Load timesheets
-        timesheets = self.data_manager.get_timesheets()
-        for timesheet in timesheets:
-            timesheet_listbox.insert(tk.END, timesheet['week_end'])
+        timesheet_list = WeekList(
+            select_frame,
+            self.data_manager.week_index('timesheets'),
+            on_activate=lambda: load_timesheet()
+        )
+        timesheet_list.grid(row=0, column=0, padx=5, pady=5)
 
         # Timesheet frame (initially hidden)
         timesheet_frame = ttk.LabelFrame(scrollable_frame, text="Daily Entries", padding="10")
@@ -269,13 +286,17 @@ class EditTimesheetForm(BaseForm):
                 'sick': sick
             }
 
+        # Live paystub preview, shown once a timesheet is loaded
+        self.preview = PaystubPreview(scrollable_frame, self.main_app.paystub_ops,
+                                      lambda: collect_entries(daily_entries))
+        for fields in daily_entries.values():
+            self.preview.watch(fields)
+
         def load_timesheet():
-            selection = timesheet_listbox.curselection()
-            if not selection:
+            week_end = timesheet_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a timesheet to edit")
                 return
-
-            week_end = timesheet_listbox.get(selection[0])
             success, result = self.timesheet_ops.get_timesheet_details(week_end)
             
             if not success:
@@ -298,26 +319,18 @@ class EditTimesheetForm(BaseForm):
 
             # Show the timesheet frame
             timesheet_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+            self.preview.frame.grid(row=3, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
+            self.preview.schedule()
 
         def save_timesheet():
-            selection = timesheet_listbox.curselection()
-            if not selection:
+            week_end = timesheet_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a timesheet to edit")
                 return
-
-            week_end = timesheet_listbox.get(selection[0])
             
             try:
                 # Collect daily entries
-                entries = {}
-                for day, fields in daily_entries.items():
-                    entries[day] = {
-                        'time_in': fields['time_in'].get().strip(),
-                        'time_out': fields['time_out'].get().strip(),
-                        'is_holiday': fields['is_holiday'].get(),
-                        'vacation_hours': fields['vacation'].get().strip() or '0',
-                        'sick_hours': fields['sick'].get().strip() or '0'
-                    }
+                entries = collect_entries(daily_entries)
 
                 # Save timesheet
                 success, message = self.timesheet_ops.add_timesheet({
@@ -335,7 +348,7 @@ class EditTimesheetForm(BaseForm):
 
         # Buttons
         button_frame = ttk.Frame(scrollable_frame)
-        button_frame.grid(row=3, column=0, pady=20)
+        button_frame.grid(row=4, column=0, pady=20)
 
         ttk.Button(button_frame, text="Load", command=load_timesheet, width=15).grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Save", command=save_timesheet, width=15).grid(row=0, column=1, padx=5)
@@ -377,21 +390,18 @@ class DeleteTimesheetForm(BaseForm):
         select_frame = ttk.LabelFrame(container, text="Select Timesheet", padding="10")
         select_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=10, pady=5)
 
-        timesheet_listbox = tk.Listbox(select_frame, width=50, height=5)
-        timesheet_listbox.grid(row=0, column=0, padx=5, pady=5)
-
         # Load timesheets
-        timesheets = self.data_manager.get_timesheets()
-        for timesheet in timesheets:
-            timesheet_listbox.insert(tk.END, timesheet['week_end'])
+        timesheet_list = WeekList(
+            select_frame,
+            self.data_manager.week_index('timesheets')
+        )
+        timesheet_list.grid(row=0, column=0, padx=5, pady=5)
 
         def delete_timesheet():
-            selection = timesheet_listbox.curselection()
-            if not selection:
+            week_end = timesheet_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a timesheet to delete")
                 return
-
-            week_end = timesheet_listbox.get(selection[0])
             
             if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the timesheet for week ending {week_end}?"):
                 success, message = self.timesheet_ops.delete_timesheet(week_end)
@@ -481,31 +491,48 @@ class DisplayTimesheetForm(BaseForm):
         timesheet_frame.grid_columnconfigure(0, weight=1)
         timesheet_frame.grid_rowconfigure(0, weight=1)
 
-        # Create listbox for timesheets
-        timesheet_listbox = tk.Listbox(timesheet_frame, height=5)
-        timesheet_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
-        
-        # Add scrollbar to listbox
-        listbox_scrollbar = ttk.Scrollbar(timesheet_frame, orient="vertical", command=timesheet_listbox.yview)
-        listbox_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        timesheet_listbox.configure(yscrollcommand=listbox_scrollbar.set)
-
         # Populate timesheet list
-        timesheets = self.data_manager.get_timesheets()
-        for timesheet in timesheets:
-            timesheet_listbox.insert(tk.END, timesheet['week_end'])
+        timesheet_list = WeekList(
+            timesheet_frame,
+            self.data_manager.week_index('timesheets'),
+            on_activate=lambda: display_timesheet()
+        )
+        timesheet_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
 
-        # Display frame for timesheet details
+        # Display frame for timesheet details, created once and updated
+        # in place for each timesheet shown
         display_frame = ttk.Frame(scrollable_frame)
         display_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=10)
 
+        week_end_var = tk.StringVar()
+        ttk.Label(display_frame, text="Week Ending:", font=('Helvetica', 12, 'bold')).grid(row=0, column=0, pady=5)
+        ttk.Label(display_frame, textvariable=week_end_var).grid(row=0, column=1, pady=5)
+
+        # Create entries frame
+        entries_frame = ttk.LabelFrame(display_frame, text="Daily Entries", padding="10")
+        entries_frame.grid(row=1, column=0, columnspan=2, pady=5, sticky=(tk.W, tk.E))
+
+        # Configure column widths
+        for i in range(6):  # 6 columns for Date, Time In, Time Out, Vacation, Sick, Holiday
+            entries_frame.grid_columnconfigure(i, weight=1)
+
+        # Headers
+        ttk.Label(entries_frame, text="Date", font=('Helvetica', 10, 'bold')).grid(row=0, column=0, pady=5, padx=10)
+        ttk.Label(entries_frame, text="Time In", font=('Helvetica', 10, 'bold')).grid(row=0, column=1, pady=5, padx=10)
+        ttk.Label(entries_frame, text="Time Out", font=('Helvetica', 10, 'bold')).grid(row=0, column=2, pady=5, padx=10)
+        ttk.Label(entries_frame, text="Vacation", font=('Helvetica', 10, 'bold')).grid(row=0, column=3, pady=5, padx=10)
+        ttk.Label(entries_frame, text="Sick", font=('Helvetica', 10, 'bold')).grid(row=0, column=4, pady=5, padx=10)
+        ttk.Label(entries_frame, text="Holiday", font=('Helvetica', 10, 'bold')).grid(row=0, column=5, pady=5, padx=10)
+        entry_rows = GridRows(entries_frame, first_row=1, pady=2, padx=10)
+
+        # Hidden until a timesheet is displayed
+        display_frame.grid_remove()
+
         def display_timesheet():
-            selection = timesheet_listbox.curselection()
-            if not selection:
+            week_end = timesheet_list.get_selected()
+            if not week_end:
                 messagebox.showwarning("Warning", "Please select a timesheet to display")
                 return
-
-            week_end = timesheet_listbox.get(selection[0])
             
             try:
                 timesheet = self.timesheet_ops.get_timesheet(week_end)
@@ -513,41 +540,19 @@ class DisplayTimesheetForm(BaseForm):
                     messagebox.showerror("Error", "Timesheet not found")
                     return
 
-                # Clear previous display
-                for widget in display_frame.winfo_children():
-                    widget.destroy()
-
                 # Display timesheet details
-                row = 0
-                ttk.Label(display_frame, text="Week Ending:", font=('Helvetica', 12, 'bold')).grid(row=row, column=0, pady=5)
-                ttk.Label(display_frame, text=timesheet['week_end']).grid(row=row, column=1, pady=5)
-                row += 1
-
-                # Create entries frame
-                entries_frame = ttk.LabelFrame(display_frame, text="Daily Entries", padding="10")
-                entries_frame.grid(row=row, column=0, columnspan=2, pady=5, sticky=(tk.W, tk.E))
-                row += 1
-
-                # Configure column widths
-                for i in range(6):  # 6 columns for Date, Time In, Time Out, Vacation, Sick, Holiday
-                    entries_frame.grid_columnconfigure(i, weight=1)
-
-                # Headers
-                ttk.Label(entries_frame, text="Date", font=('Helvetica', 10, 'bold')).grid(row=0, column=0, pady=5, padx=10)
-                ttk.Label(entries_frame, text="Time In", font=('Helvetica', 10, 'bold')).grid(row=0, column=1, pady=5, padx=10)
-                ttk.Label(entries_frame, text="Time Out", font=('Helvetica', 10, 'bold')).grid(row=0, column=2, pady=5, padx=10)
-                ttk.Label(entries_frame, text="Vacation", font=('Helvetica', 10, 'bold')).grid(row=0, column=3, pady=5, padx=10)
-                ttk.Label(entries_frame, text="Sick", font=('Helvetica', 10, 'bold')).grid(row=0, column=4, pady=5, padx=10)
-                ttk.Label(entries_frame, text="Holiday", font=('Helvetica', 10, 'bold')).grid(row=0, column=5, pady=5, padx=10)
-
-                # Display entries
-                for i, (date, entry) in enumerate(timesheet['entries'].items(), start=1):
-                    ttk.Label(entries_frame, text=date).grid(row=i, column=0, pady=2, padx=10)
-                    ttk.Label(entries_frame, text=entry['time_in'] or '').grid(row=i, column=1, pady=2, padx=10)
-                    ttk.Label(entries_frame, text=entry['time_out'] or '').grid(row=i, column=2, pady=2, padx=10)
-                    ttk.Label(entries_frame, text=entry['vacation_hours']).grid(row=i, column=3, pady=2, padx=10)
-                    ttk.Label(entries_frame, text=entry['sick_hours']).grid(row=i, column=4, pady=2, padx=10)
-                    ttk.Label(entries_frame, text="Yes" if entry['is_holiday'] else "No").grid(row=i, column=5, pady=2, padx=10)
+                week_end_var.set(timesheet['week_end'])
+                entry_rows.update({
+                    date: [
+                        date,
+                        entry['time_in'] or '',
+                        entry['time_out'] or '',
+                        entry['vacation_hours'],
+                        entry['sick_hours'],
+                        "Yes" if entry['is_holiday'] else "No"
+                    ]
+                    for date, entry in timesheet['entries'].items()
+                })
 
                 # Show the display frame
                 display_frame.grid()
@@ -0,0 +1,184 @@
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from tkinter import ttk
+
+class WeekList:
+    """Searchable, virtualized list of week end dates for the record pickers
+
+    Weeks are kept sorted, so a From/To date range is two binary searches.
+    Typing in the search box narrows the range further to weeks containing
+    the text (e.g. "2024-03"). Only the rows that fit in the listbox are
+    ever inserted into it; scrolling swaps the visible slice instead of
+    keeping every week in the widget.
+    """
+    def __init__(self, parent, weeks, height=5, width=50, on_activate=None):
+        self.height = height
+        self.on_activate = on_activate
+        self.weeks = sorted(weeks)
+        self.filtered = self.weeks
+        self.offset = 0
+        self.selected = None
+
+        self.frame = ttk.Frame(parent)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        # Filters
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        self.search_var = tk.StringVar()
+        self.from_var = tk.StringVar()
+        self.to_var = tk.StringVar()
+        for column, (label, variable, entry_width) in enumerate([
+            ("Search:", self.search_var, 12),
+            ("From:", self.from_var, 11),
+            ("To:", self.to_var, 11)
+        ]):
+            ttk.Label(filter_frame, text=label).grid(row=0, column=column * 2, padx=(5, 2))
+            ttk.Entry(filter_frame, textvariable=variable, width=entry_width).grid(row=0, column=column * 2 + 1)
+            variable.trace_add('write', lambda *args: self.apply_filter())
+
+        # Visible rows
+        self.listbox = tk.Listbox(self.frame, width=width, height=height, exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+
+        self.count_var = tk.StringVar()
+        ttk.Label(self.frame, textvariable=self.count_var, foreground="gray").grid(
+            row=2, column=0, columnspan=2, sticky=tk.W
+        )
+
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self.listbox.bind('<Double-Button-1>', self._on_double_click)
+        self.listbox.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.listbox.bind('<Button-4>', lambda event: self.scroll(-1))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll(1))
+        self.listbox.bind('<Up>', lambda event: self._move_selection(-1))
+        self.listbox.bind('<Down>', lambda event: self._move_selection(1))
+
+        self._render()
+
+    def grid(self, **kwargs):
+        """Place the widget in its parent"""
+        self.frame.grid(**kwargs)
+
+    def set_weeks(self, weeks):
+        """Replace the listed weeks, keeping the filters"""
+        self.weeks = sorted(weeks)
+        if self.selected not in self.weeks:
+            self.selected = None
+        self.apply_filter()
+
+    def remove(self, week_end):
+        """Remove one week from the list"""
+        index = bisect_left(self.weeks, week_end)
+        if index < len(self.weeks) and self.weeks[index] == week_end:
+            self.weeks = self.weeks[:index] + self.weeks[index + 1:]
+            if self.selected == week_end:
+                self.selected = None
+            self.apply_filter()
+
+    def get_selected(self):
+        """Get the selected week end date, or None if it is filtered out"""
+        if self._filtered_index(self.selected) is None:
+            return None
+        return self.selected
+
+    def apply_filter(self):
+        """Narrow the weeks to the date range, then to the search text"""
+        start = 0
+        end = len(self.weeks)
+        date_from = self.from_var.get().strip()
+        date_to = self.to_var.get().strip()
+        if date_from:
+            start = bisect_left(self.weeks, date_from)
+        if date_to:
+            # Every date with the typed prefix counts as within range
+            end = bisect_right(self.weeks, date_to + '\uffff')
+
+        filtered = self.weeks[start:end]
+        search = self.search_var.get().strip()
+        if search:
+            filtered = [week for week in filtered if search in week]
+
+        self.filtered = filtered
+        self.offset = 0
+        index = self._filtered_index(self.selected)
+        if index is not None:
+            self.offset = self._clamp(index - self.height // 2)
+        self._render()
+
+    def scroll(self, rows):
+        """Scroll the visible window by a number of rows"""
+        offset = self._clamp(self.offset + rows)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+        return "break"
+
+    def _filtered_index(self, week_end):
+        """Find a week in the filtered list, which stays sorted"""
+        if week_end is None:
+            return None
+        index = bisect_left(self.filtered, week_end)
+        if index < len(self.filtered) and self.filtered[index] == week_end:
+            return index
+        return None
+
+    def _clamp(self, offset):
+        return max(0, min(offset, len(self.filtered) - self.height))
+
+    def _render(self):
+        """Show the rows of the visible window"""
+        visible = self.filtered[self.offset:self.offset + self.height]
+        self.listbox.delete(0, tk.END)
+        for week_end in visible:
+            self.listbox.insert(tk.END, week_end)
+        if self.selected in visible:
+            row = visible.index(self.selected)
+            self.listbox.selection_set(row)
+            self.listbox.activate(row)
+
+        total = len(self.filtered)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(visible)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_var.set(f"{total} of {len(self.weeks)} weeks")
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags and clicks"""
+        if action == 'moveto':
+            self.offset = self._clamp(int(float(amount) * len(self.filtered)))
+            self._render()
+        elif action == 'scroll':
+            step = self.height if unit == 'pages' else 1
+            self.scroll(int(amount) * step)
+
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.filtered[self.offset + selection[0]]
+
+    def _on_double_click(self, event):
+        self._on_listbox_select(event)
+        if self.selected and self.on_activate:
+            self.on_activate()
+
+    def _move_selection(self, step):
+        """Move the selection with the arrow keys, scrolling at the edges"""
+        if not self.filtered:
+            return "break"
+        index = self._filtered_index(self.selected)
+        if index is None:
+            index = self.offset
+        else:
+            index += step
+        index = max(0, min(index, len(self.filtered) - 1))
+        self.selected = self.filtered[index]
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.height:
+            self.offset = index - self.height + 1
+        self._render()
+        return "break"
@@ -1,11 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ..forms.paystub_forms import (
-    GeneratePaystubForm,
-    DisplayPaystubForm,
-    PrintPaystubForm,
-    DeletePaystubForm
-)
 from gui.gui_utils import center_elements
 from ..forms.base_form import BaseForm
 
@@ -59,12 +53,33 @@ class PaystubMenu(BaseForm):
             width=30
         ).grid(row=4, column=0, pady=10)
 
+        ttk.Button(
+            container,
+            text="Enter Actual Paystub",
+            command=self.show_enter_actual_paystub,
+            width=30
+        ).grid(row=5, column=0, pady=10)
+
+        ttk.Button(
+            container,
+            text="Compare Actual Paystub",
+            command=self.show_compare_paystub,
+            width=30
+        ).grid(row=6, column=0, pady=10)
+
+        ttk.Button(
+            container,
+            text="Rebuild Stale Paystubs",
+            command=self.rebuild_stale_paystubs,
+            width=30
+        ).grid(row=7, column=0, pady=10)
+
         ttk.Button(
             container,
             text="Back to Main Menu",
             command=self._on_close,
             width=30
-        ).grid(row=5, column=0, pady=10)
+        ).grid(row=8, column=0, pady=10)
 
         # Center all elements in the container
         center_elements(container)
@@ -74,16 +89,53 @@ class PaystubMenu(BaseForm):
 
     def show_generate_paystub(self):
         """Show the generate paystub form"""
+        from ..forms.paystub_forms import GeneratePaystubForm
         self.show_child_window(GeneratePaystubForm(self.main_app))
 
     def show_display_paystub(self):
         """Show the display paystub form"""
+        from ..forms.paystub_forms import DisplayPaystubForm
         self.show_child_window(DisplayPaystubForm(self.main_app))
 
     def show_print_paystub(self):
         """Show the print paystub form"""
+        from ..forms.paystub_forms import PrintPaystubForm
         self.show_child_window(PrintPaystubForm(self.main_app))
         
     def show_delete_paystub(self):
         """Show the delete paystub form"""
+        from ..forms.paystub_forms import DeletePaystubForm
         self.show_child_window(DeletePaystubForm(self.main_app))
+
+    def show_enter_actual_paystub(self):
+        """Show the enter actual paystub form"""
+        from ..forms.paystub_forms import EnterActualPaystubForm
+        self.show_child_window(EnterActualPaystubForm(self.main_app))
+
+    def show_compare_paystub(self):
+        """Show the compare paystub form"""
+        from ..forms.paystub_forms import ComparePaystubForm
+        self.show_child_window(ComparePaystubForm(self.main_app))
+
+    def rebuild_stale_paystubs(self):
+        """Recalculate paystubs whose timesheet or employee rules changed"""
+        paystub_ops = self.main_app.paystub_ops
+        success, stale = paystub_ops.find_stale_paystubs()
+        if not success:
+            messagebox.showerror("Error", stale)
+            return
+        if not stale:
+            messagebox.showinfo("Rebuild Stale Paystubs", "All paystubs are up to date.")
+            return
+        if not messagebox.askyesno(
+            "Rebuild Stale Paystubs",
+            f"{len(stale)} paystub(s) are out of date. Rebuild them now?"
+        ):
+            return
+
+        results = paystub_ops.rebuild_stale_paystubs()
+        errors = [message for ok, message in results if not ok]
+        if errors:
+            messagebox.showerror("Error", "\n".join(errors))
+        else:
+            messagebox.showinfo("Success", f"Rebuilt {len(results)} paystub(s).")
@@ -1,12 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ..forms.timesheet_forms import (
-    EnterTimesheetForm,
-    EditTimesheetForm,
-    DeleteTimesheetForm,
-    DisplayTimesheetForm,
-    PrintTimesheetForm
-)
 from gui.gui_utils import center_elements, center_frame
 from ..forms.base_form import BaseForm
 
@@ -82,20 +75,25 @@ class TimesheetMenu(BaseForm):
 
     def show_enter_timesheet(self):
         """Show the enter timesheet form"""
+        from ..forms.timesheet_forms import EnterTimesheetForm
         self.show_child_window(EnterTimesheetForm(self.main_app))
 
     def show_edit_timesheet(self):
         """Show the edit timesheet form"""
+        from ..forms.timesheet_forms import EditTimesheetForm
         self.show_child_window(EditTimesheetForm(self.main_app))
 
     def show_delete_timesheet(self):
         """Show the delete timesheet form"""
+        from ..forms.timesheet_forms import DeleteTimesheetForm
         self.show_child_window(DeleteTimesheetForm(self.main_app))
 
     def show_display_timesheet(self):
         """Show the display timesheet form"""
+        from ..forms.timesheet_forms import DisplayTimesheetForm
         self.show_child_window(DisplayTimesheetForm(self.main_app))
 
     def show_print_timesheet(self):
         """Show the print timesheet form"""
+        from ..forms.timesheet_forms import PrintTimesheetForm
         self.show_child_window(PrintTimesheetForm(self.main_app))
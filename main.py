@@ -1,13 +1,21 @@
+import time
+_STARTED = time.perf_counter()
+
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
-from data.data_manager import DataManager
+from data.storage import open_data_manager
 from employee_operations import EmployeeOperations
 from timesheet_operations import TimesheetOperations
 from paystub_operations import PaystubOperations
 from gui.gui_utils import center_window, center_elements
-from gui.menus.timesheet_menu import TimesheetMenu
-from gui.menus.paystub_menu import PaystubMenu
-from gui.forms.employee_forms import EmployeeMenu
+
+# Time from main.py starting to load until the main menu is ready for input. Menus and forms
+# are imported when first opened, and only the selected storage backend is
+# loaded, to stay under it. Set PAYSTUB_TIMING=1 to always print the
+# measured startup time.
+STARTUP_TARGET_MS = 250
 
 class WageCalculatorGUI:
     def __init__(self, root):
@@ -17,7 +25,7 @@ class WageCalculatorGUI:
         center_window(self.root)
         
         # Initialize operations
-        self.data_manager = DataManager()
+        self.data_manager = open_data_manager()
         self.employee_ops = EmployeeOperations(self.data_manager)
         self.timesheet_ops = TimesheetOperations(self.data_manager)
         self.paystub_ops = PaystubOperations(self.data_manager)
@@ -26,10 +34,10 @@ class WageCalculatorGUI:
         self.main_container = ttk.Frame(self.root, padding="10")
         self.main_container.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-        # Initialize forms
-        self.employee_menu = EmployeeMenu(self)
-        self.timesheet_menu = TimesheetMenu(self, self)
-        self.paystub_menu = PaystubMenu(self, self)
+        # Menus are created the first time they are shown
+        self.employee_menu = None
+        self.timesheet_menu = None
+        self.paystub_menu = None
 
         # Create and show main menu
         self.create_main_menu()
@@ -63,6 +71,7 @@ class WageCalculatorGUI:
 
     def exit_application(self):
         """Properly exit the application"""
+        self.data_manager.close()
         self.root.destroy()
 
     def create_main_menu(self):
@@ -117,25 +126,41 @@ class WageCalculatorGUI:
     def show_employee_menu(self):
         """Show the employee menu and hide the main window"""
         self.root.withdraw()
+        if self.employee_menu is None:
+            from gui.forms.employee_forms import EmployeeMenu
+            self.employee_menu = EmployeeMenu(self)
         self.employee_menu.show()
 
     def show_timesheet_menu(self):
         """Show the timesheet menu and hide the main window"""
         self.root.withdraw()
+        if self.timesheet_menu is None:
+            from gui.menus.timesheet_menu import TimesheetMenu
+            self.timesheet_menu = TimesheetMenu(self, self)
         self.timesheet_menu.show()
 
     def show_paystub_menu(self):
         """Show the paystub menu and hide the main window"""
         self.root.withdraw()
+        if self.paystub_menu is None:
+            from gui.menus.paystub_menu import PaystubMenu
+            self.paystub_menu = PaystubMenu(self, self)
         self.paystub_menu.show()
 
     def show_main_menu(self):
         """Show the main menu"""
         self.root.deiconify()
 
+def report_startup_time():
+    """Print the startup time if it misses the target or timing was requested"""
+    elapsed_ms = (time.perf_counter() - _STARTED) * 1000
+    if elapsed_ms > STARTUP_TARGET_MS or os.environ.get('PAYSTUB_TIMING'):
+        print(f"Startup took {elapsed_ms:.0f} ms (target {STARTUP_TARGET_MS} ms)", file=sys.stderr)
+
 def main():
     root = tk.Tk()
     app = WageCalculatorGUI(root)
+    root.after_idle(report_startup_time)
     root.mainloop()
 
 if __name__ == "__main__":
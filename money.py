@@ -0,0 +1,55 @@
+""" Integer-cents money arithmetic
+
+Pay amounts are calculated as whole cents. Rates are kept as exact
+fractions of the decimal values entered by the user, and every line item
+is rounded once, half up, to the cent. Totals are sums of rounded line
+items, so the results are exact and can be compared with ==.
+
+The helpers only use integer operators, so they also work on NumPy
+integer arrays.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+
+# Hours are counted in hundredths of a minute, which is exact for clock
+# times and for hours entered with up to two decimals.
+HOUR_UNITS = 6000
+
+# Rates are kept to eight decimal places. This drops float noise such as
+# 0.018799999999999997 for a rate entered as 1.88%, which would otherwise
+# become a fraction with a 17 digit denominator.
+RATE_SCALE = 10 ** 8
+
+def round_div(numerator, denominator):
+    """Divide integers, rounding halves up"""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+def rate_fraction(rate):
+    """Get a rate or amount as an exact (numerator, denominator) pair
+
+    The value is rounded half up to eight decimal places first.
+    """
+    fraction = Fraction(str(rate))
+    fraction = Fraction(round_div(fraction.numerator * RATE_SCALE, fraction.denominator), RATE_SCALE)
+    return fraction.numerator, fraction.denominator
+
+def to_cents(amount):
+    """Convert a dollar amount to whole cents, rounding halves up"""
+    return int(Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100)
+
+def to_dollars(cents):
+    """Convert whole cents to a dollar amount"""
+    return cents / 100
+
+def to_hour_units(hours):
+    """Convert hours to whole hour units"""
+    return int(round(hours * HOUR_UNITS))
+
+def apply_rate(amount, rate, divisor=1):
+    """Multiply an integer amount by an exact rate, rounding halves up
+
+    rate is a (numerator, denominator) pair from rate_fraction. The product
+    is divided by divisor before rounding, which lets callers scale units.
+    """
+    numerator, denominator = rate
+    return round_div(amount * numerator, denominator * divisor)
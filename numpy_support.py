@@ -0,0 +1,14 @@
+""" NumPy as an optional dependency
+
+Only the vectorized payroll engine and the array view of the paystub
+archive use NumPy. They import it through import_numpy() when they run,
+so everything else works without it installed.
+"""
+
+def import_numpy(feature):
+    """Import NumPy, raising an ImportError that names the feature needing it"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"{feature} requires NumPy (pip install numpy)")
+    return numpy
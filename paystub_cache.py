@@ -0,0 +1,106 @@
+""" Memoized paystub calculations
+
+Paystubs are a pure function of the timesheet and of the employee's pay
+rate and deduction rules. PaystubCache keeps recently calculated paystubs
+keyed by a stable hash of those inputs, evicting the least recently used
+entry once max_size is reached. Hit and miss counts are kept so the size
+bound can be tuned: the command line prints them with --cache-stats and
+takes the size from --cache-size, and the PAYSTUB_CACHE_SIZE environment
+variable sets the default size, for the GUI too. Cached paystubs are stored as compact Paystub records
+and every lookup gets a new dict, so callers can't change a cached entry.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from record_types import Paystub, to_dict
+
+DEFAULT_CACHE_SIZE = 1024
+
+# Employee fields that affect a calculated paystub
+RULE_FIELDS = ['employee_id', 'pay_rate', 'union', 'special_deductions', 'payroll_deductions']
+
+def _fingerprint(data):
+    """Stable hash of JSON-compatible data"""
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def timesheet_fingerprint(timesheet):
+    """Hash of the timesheet fields a paystub is calculated from"""
+    timesheet = to_dict(timesheet)
+    return _fingerprint({'week_end': timesheet['week_end'], 'entries': timesheet['entries']})
+
+def employee_rules_fingerprint(employee):
+    """Hash of the employee's pay rate and deduction rules"""
+    return _fingerprint({field: employee.get(field) for field in RULE_FIELDS})
+
+def default_cache_size():
+    """Get the cache size from PAYSTUB_CACHE_SIZE, falling back to DEFAULT_CACHE_SIZE"""
+    text = os.environ.get('PAYSTUB_CACHE_SIZE')
+    if not text:
+        return DEFAULT_CACHE_SIZE
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid PAYSTUB_CACHE_SIZE: {text}")
+
+class PaystubCache:
+    def __init__(self, max_size=None):
+        self.max_size = default_cache_size() if max_size is None else max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._last_employee = None
+        self._last_rules = None
+
+    def rules_fingerprint(self, employee):
+        """Fingerprint an employee, reusing it while the record is unchanged"""
+        # Employee records are replaced, not edited in place, when saved
+        if employee is not self._last_employee:
+            self._last_employee = employee
+            self._last_rules = employee_rules_fingerprint(employee)
+        return self._last_rules
+
+    def key(self, employee, timesheet):
+        """Get the cache key of a calculation, or None if it can't be cached"""
+        if not employee:
+            return None
+        try:
+            return self.rules_fingerprint(employee), timesheet_fingerprint(timesheet)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def get(self, key):
+        """Get a copy of a cached paystub, or None on a miss"""
+        if key is not None and key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key].to_dict()
+        self.misses += 1
+        return None
+
+    def put(self, key, paystub_data):
+        """Cache a calculated paystub, evicting the least recently used"""
+        if key is None or self.max_size <= 0:
+            return
+        self.entries[key] = Paystub.from_dict(paystub_data)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached paystubs and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Get the hit/miss counts and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'max_size': self.max_size
+        }
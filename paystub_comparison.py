@@ -0,0 +1,68 @@
+""" Comparison of employer-issued paystubs against calculated ones
+
+An actual paystub has the same layout as a calculated one: 'hours',
+'wages', 'pay', 'pre_tax_deductions', 'post_tax_deductions' and
+'additions' sections keyed by category or deduction code. Actual stubs
+only need the lines printed on the paper stub. Sections left out of an
+actual stub are not compared. Within an itemized section that was entered,
+a line missing from either side counts as zero, so a deduction the
+employer skipped shows up as a difference; pay totals are only compared
+where the actual stub gives them.
+"""
+
+# Sections compared line by line, in display order
+SECTIONS = ['hours', 'wages', 'pay', 'pre_tax_deductions', 'post_tax_deductions', 'additions']
+
+# Sections holding totals rather than itemized lines
+TOTAL_SECTIONS = ['pay']
+
+# Largest difference accepted as a match, per section
+DEFAULT_TOLERANCES = {
+    'hours': 0.01,
+    'wages': 0.01,
+    'pay': 0.01,
+    'pre_tax_deductions': 0.01,
+    'post_tax_deductions': 0.01,
+    'additions': 0.01
+}
+
+def compare_paystubs(computed, actual, tolerances=None):
+    """ Diff an actual paystub against a calculated one line by line
+        Consumes: dict (calculated paystub), dict (actual paystub),
+                  dict (tolerance per section, optional)
+        Returns: list of dict lines with section, name, computed, actual,
+                 difference (actual - computed) and matches
+    """
+    tolerances = dict(DEFAULT_TOLERANCES, **(tolerances or {}))
+    lines = []
+    for section in SECTIONS:
+        if section not in actual:
+            continue
+        computed_amounts = computed.get(section) or {}
+        actual_amounts = actual[section] or {}
+
+        # Calculated lines first, then any the employer added
+        if section in TOTAL_SECTIONS:
+            names = [name for name in computed_amounts if name in actual_amounts]
+        else:
+            names = list(computed_amounts)
+        names += [name for name in actual_amounts if name not in computed_amounts]
+
+        for name in names:
+            computed_amount = float(computed_amounts.get(name, 0))
+            actual_amount = float(actual_amounts.get(name, 0))
+            # Rounded so float noise never decides a match
+            difference = round(actual_amount - computed_amount, 6)
+            lines.append({
+                'section': section,
+                'name': name,
+                'computed': computed_amount,
+                'actual': actual_amount,
+                'difference': difference,
+                'matches': abs(difference) <= tolerances[section]
+            })
+    return lines
+
+def find_mismatches(lines):
+    """Get the lines of a comparison that are outside tolerance"""
+    return [line for line in lines if not line['matches']]
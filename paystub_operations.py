@@ -1,10 +1,69 @@
 from datetime import datetime
-from calculate_wages import calculate_wages
-from calculate_deductions import calculate_deductions
+from calculate_hours import calculate_weekly_hours
+from calculate_paystub import calculate_paystub, split_deductions
+from calculate_wages import WAGE_CATEGORIES
+from calculate_deductions import compile_deduction_plan
+from paystub_cache import PaystubCache, timesheet_fingerprint
+from paystub_comparison import SECTIONS, compare_paystubs, find_mismatches
+
+# Items handed to a worker process at a time in parallel batch runs
+DEFAULT_CHUNKSIZE = 64
+
+def calculate_paystubs(items):
+    """Calculate paystubs for (employee, timesheet) pairs
+
+    Returns a (paystub, error message) tuple per item so one bad timesheet
+    does not stop the rest of the batch.
+    """
+    results = []
+    plans = {}
+    for employee, timesheet in items:
+        try:
+            # Compile each employee's deduction rules once per batch
+            if employee and id(employee) not in plans:
+                plans[id(employee)] = compile_deduction_plan(employee)
+            plan = plans.get(id(employee))
+            results.append((calculate_paystub(timesheet, employee, plan), None))
+        except ValueError as e:
+            results.append((None, str(e)))
+        except Exception as e:
+            results.append((None, f"An error occurred: {str(e)}"))
+    return results
+
+def calculate_paystubs_vectorized(items):
+    """Calculate paystubs with the NumPy engine, imported on first use"""
+    from calculate_vectorized import calculate_paystubs_vectorized
+    return calculate_paystubs_vectorized(items)
+
+# Calculation engines selectable for batch runs
+ENGINES = {
+    'scalar': calculate_paystubs,
+    'vectorized': calculate_paystubs_vectorized
+}
+
+def calculate_paystubs_in_parallel(items, workers, chunksize=DEFAULT_CHUNKSIZE, engine='scalar'):
+    """Calculate paystubs across a pool of worker processes
+
+    Items are submitted in chunks so each task carries enough work to pay
+    for the inter-process transfer; an employee record shared by the items
+    of a chunk is only pickled once. Results come back in item order.
+    """
+    # Imported here so single-process runs skip the multiprocessing startup cost
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(ENGINES[engine], chunks):
+            results.extend(chunk_results)
+    return results
 
 class PaystubOperations:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, cache=None, cache_size=None):
         self.data_manager = data_manager
+        # Calculated paystubs of unchanged timesheets and employee rules,
+        # holding cache_size paystubs (default: $PAYSTUB_CACHE_SIZE or 1024)
+        self.cache = cache if cache is not None else PaystubCache(cache_size)
 
     def validate_paystub_data(self, paystub_data):
         """Validate paystub data"""
@@ -33,123 +92,18 @@ class PaystubOperations:
 
     def calculate_hours(self, timesheet):
         """Calculate hours from timesheet data"""
-        hours = {
-            'Regular': 0.0,
-            'Regular OT': 0.0,
-            'Holiday': 0.0,
-            'Holiday OT': 0.0,
-            'Vacation': 0.0,
-            'Sick': 0.0,
-            'Differential': 0.0
-        }
-
-        for entry in timesheet['entries'].values():
-            # Skip if no time in/out
-            if not entry['time_in'] or not entry['time_out']:
-                continue
-
-            # Calculate daily hours from time in/out
-            time_in = datetime.strptime(entry['time_in'], "%H:%M")
-            time_out = datetime.strptime(entry['time_out'], "%H:%M")
-            daily_hours = (time_out - time_in).total_seconds() / 3600
-            
-            # Add vacation and sick hours
-            hours['Vacation'] += float(entry['vacation_hours'])
-            hours['Sick'] += float(entry['sick_hours'])
-            
-            # Calculate regular vs OT hours
-            if entry['is_holiday']:
-                if daily_hours <= 7:
-                    hours['Holiday'] += daily_hours
-                else:
-                    hours['Holiday'] += 7
-                    hours['Holiday OT'] += daily_hours - 7
-            else:
-                current_regular = hours['Regular']
-                if current_regular < 37.5:
-                    if current_regular + daily_hours <= 37.5:
-                        hours['Regular'] += daily_hours
-                    else:
-                        hours['Regular'] += (37.5 - current_regular)
-                        hours['Regular OT'] += (current_regular + daily_hours - 37.5)
-                else:
-                    hours['Regular OT'] += daily_hours
-
-            # Calculate differential (night hours)
-            if time_in.hour >= 17 or time_out.hour < 7:
-                hours['Differential'] += daily_hours
-
-        return hours
+        return calculate_weekly_hours(timesheet)
 
     def generate_paystub(self, timesheet):
         """Generate a new paystub"""
         try:
             employee = self.data_manager.employee
-            if not employee:
-                return False, "Employee not found."
-
-            # Calculate hours
-            hours = self.calculate_hours(timesheet)
-            
-            # Calculate days worked
-            days_worked = len([entry for entry in timesheet['entries'].values() 
-                             if entry['time_in'] and entry['time_out']])
-
-            # Calculate wages
-            wages = calculate_wages(hours, float(employee['pay_rate']))
-            
-            # Calculate gross pay
-            gross_pay = sum(wages.values())
-            
-            # Calculate deductions
-            deductions = calculate_deductions(gross_pay, employee, days_worked)
-            
-            # Organize deductions into pre-tax and post-tax, and separate additions
-            pre_tax_deductions = {}
-            post_tax_deductions = {}
-            additions = {}
-            
-            for deduction_id, amount in deductions.items():
-                if deduction_id in ['401K% T', 'UNION N', 'UN INST', 'AFLCNTT', 'WILTONN']:
-                    pre_tax_deductions[deduction_id] = amount
-                elif deduction_id in ['LONGEVT', 'MEALS N', 'TRAVELN']:
-                    additions[deduction_id] = amount
-                else:
-                    post_tax_deductions[deduction_id] = amount
-
-            # Add DIS-SUI deduction
-            post_tax_deductions['DIS-SUI'] = 0.60
-
-            # Calculate total pre-tax deductions
-            total_pre_tax = sum(pre_tax_deductions.values())
-            
-            # Calculate adjusted gross (gross - pre-tax deductions)
-            adjusted_gross = gross_pay - total_pre_tax
-            
-            # Calculate total post-tax deductions
-            total_post_tax = sum(post_tax_deductions.values())
-            
-            # Calculate total additions
-            total_additions = sum(additions.values())
-            
-            # Calculate net pay (adjusted gross - post-tax deductions + additions)
-            net_pay = adjusted_gross - total_post_tax + total_additions
-            
-            # Create paystub data
-            paystub_data = {
-                'week_end': timesheet['week_end'],
-                'hours': hours,
-                'wages': wages,
-                'pay': {
-                    'gross': gross_pay,
-                    'adjusted_gross': adjusted_gross,
-                    'net': net_pay
-                },
-                'pre_tax_deductions': pre_tax_deductions,
-                'post_tax_deductions': post_tax_deductions,
-                'additions': additions
-            }
-
+            key = self.cache.key(employee, timesheet)
+            paystub_data = self.cache.get(key)
+            if paystub_data is None:
+                paystub_data = calculate_paystub(timesheet, employee, self.data_manager.deduction_plan)
+                self.cache.put(key, paystub_data)
+            self._record_source(paystub_data, key)
             self.validate_paystub_data(paystub_data)
             self.data_manager.add_paystub(paystub_data)
             return True, "Paystub generated successfully!"
@@ -158,6 +112,133 @@ class PaystubOperations:
         except Exception as e:
             return False, f"An error occurred: {str(e)}"
 
+    def preview_paystub(self, timesheet, hours=None):
+        """Calculate a paystub without saving it
+
+        hours may be passed in from an IncrementalWeeklyHours tracker so
+        only the edited days of the timesheet are recalculated.
+        """
+        try:
+            paystub_data = calculate_paystub(
+                timesheet, self.data_manager.employee, self.data_manager.deduction_plan, hours
+            )
+            return True, paystub_data
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
+    def generate_paystubs(self, items, workers=None, chunksize=DEFAULT_CHUNKSIZE, engine='scalar'):
+        """Generate paystubs for many (employee, timesheet) pairs
+
+        Every paystub is calculated first and all of them are saved with a
+        single write at the end. With workers set, the calculations are
+        spread over that many processes in chunks of chunksize items.
+        The engine is 'scalar' or 'vectorized' (NumPy, same results).
+        Items already in the paystub cache are not recalculated.
+        Returns one (bool, message) tuple per item.
+        """
+        if engine not in ENGINES:
+            return [(False, f"Unknown calculation engine: {engine}")]
+
+        items = list(items)
+        keys = [self.cache.key(employee, timesheet) for employee, timesheet in items]
+        calculated = [(self.cache.get(key), None) for key in keys]
+        pending = [index for index, (paystub_data, error) in enumerate(calculated) if paystub_data is None]
+        pending_items = [items[index] for index in pending]
+        try:
+            if workers and workers > 1 and len(pending_items) > chunksize:
+                pending_results = calculate_paystubs_in_parallel(pending_items, workers, chunksize, engine)
+            else:
+                pending_results = ENGINES[engine](pending_items)
+        except ImportError as e:
+            return [(False, str(e)) for item in items]
+
+        for index, (paystub_data, error) in zip(pending, pending_results):
+            calculated[index] = (paystub_data, error)
+            if not error:
+                self.cache.put(keys[index], paystub_data)
+
+        for (paystub_data, error), key in zip(calculated, keys):
+            if paystub_data is not None:
+                self._record_source(paystub_data, key)
+
+        results = []
+        paystubs = []
+        saved = []
+        for (employee, timesheet), (paystub_data, error) in zip(items, calculated):
+            try:
+                if error:
+                    raise ValueError(error)
+                self.validate_paystub_data(paystub_data)
+                paystubs.append(paystub_data)
+                saved.append(len(results))
+                results.append((True, f"Paystub generated for week ending {paystub_data['week_end']}"))
+            except ValueError as e:
+                results.append((False, str(e)))
+            except Exception as e:
+                results.append((False, f"An error occurred: {str(e)}"))
+
+        if paystubs:
+            try:
+                self.data_manager.add_paystubs(paystubs)
+            except Exception as e:
+                for index in saved:
+                    results[index] = (False, f"An error occurred: {str(e)}")
+        return results
+
+    def _record_source(self, paystub_data, key):
+        """Stamp a paystub with the fingerprints of the inputs it came from"""
+        if key is not None:
+            rules, timesheet = key
+            paystub_data['source'] = {'rules': rules, 'timesheet': timesheet}
+
+    def find_stale_paystubs(self):
+        """Find paystubs whose timesheet or employee rules have changed
+
+        A paystub is stale when the fingerprints it was stamped with no
+        longer match its timesheet and the current employee record.
+        Paystubs saved before fingerprints were recorded count as stale.
+        Paystubs without a timesheet can't be rebuilt and are skipped.
+        Returns: (bool, list of week_end dates or error message)
+        """
+        try:
+            employee = self.data_manager.employee
+            if not employee:
+                return False, "Employee not found."
+            rules = self.cache.rules_fingerprint(employee)
+
+            stale = []
+            for paystub in self.data_manager.get_paystubs():
+                timesheet = self.data_manager.get_parsed_timesheet(paystub['week_end'])
+                if not timesheet:
+                    continue
+                source = paystub.get('source') or {}
+                if source.get('rules') != rules or source.get('timesheet') != timesheet_fingerprint(timesheet):
+                    stale.append(paystub['week_end'])
+            return True, sorted(stale)
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
+    def rebuild_stale_paystubs(self, workers=None, chunksize=DEFAULT_CHUNKSIZE, engine='scalar'):
+        """Recalculate only the stale paystubs in one batch
+
+        Returns one (bool, message) tuple per rebuilt paystub, like
+        generate_paystubs.
+        """
+        success, stale = self.find_stale_paystubs()
+        if not success:
+            return [(False, stale)]
+        employee = self.data_manager.employee
+        return self.generate_paystubs(
+            [(employee, self.data_manager.get_parsed_timesheet(week_end)) for week_end in stale],
+            workers, chunksize, engine
+        )
+
+    def get_cache_stats(self):
+        """Get the paystub cache's hit/miss counts and size"""
+        return self.cache.stats()
+
     def get_paystub_details(self, week_end):
         """Get paystub details"""
         try:
@@ -168,6 +249,13 @@ class PaystubOperations:
         except Exception as e:
             return False, f"An error occurred: {str(e)}"
 
+    def get_paystub_ytd(self, week_end):
+        """Get year to date totals of the stored paystubs through a week"""
+        try:
+            return True, self.data_manager.get_ytd(week_end)
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
     def get_employee_paystubs(self):
         """Get all paystubs for the employee"""
         try:
@@ -191,4 +279,185 @@ class PaystubOperations:
             else:
                 return False, "Failed to delete paystub."
         except Exception as e:
-            return False, f"An error occurred: {str(e)}"
\ No newline at end of file
+            return False, f"An error occurred: {str(e)}"
+
+    def validate_actual_paystub_data(self, paystub_data):
+        """Validate an employer-issued paystub"""
+        if not paystub_data.get('week_end'):
+            raise ValueError("Week end date is required")
+
+        try:
+            datetime.strptime(paystub_data['week_end'], "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+        if not any(paystub_data.get(section) for section in SECTIONS):
+            raise ValueError("Enter at least one paystub line")
+
+        # Year to date columns, when entered, have the same sections
+        ytd = paystub_data.get('ytd') or {}
+        for amounts in [paystub_data, ytd]:
+            for section in SECTIONS:
+                for name, amount in (amounts.get(section) or {}).items():
+                    try:
+                        float(amount)
+                    except (TypeError, ValueError):
+                        raise ValueError(f"Invalid amount for {name}")
+
+    def add_actual_paystub(self, paystub_data):
+        """Save an employer-issued paystub for comparison"""
+        try:
+            self.validate_actual_paystub_data(paystub_data)
+            self.data_manager.add_actual_paystub(paystub_data)
+            return True, "Actual paystub saved successfully!"
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
+    def import_actual_paystubs(self, paystubs):
+        """Save many employer-issued paystubs with a single write
+
+        Invalid paystubs are skipped. Returns one (bool, message) tuple per
+        paystub.
+        """
+        results = []
+        valid = []
+        for paystub_data in paystubs:
+            try:
+                self.validate_actual_paystub_data(paystub_data)
+                valid.append(paystub_data)
+                results.append((True, f"Actual paystub saved for week ending {paystub_data['week_end']}"))
+            except ValueError as e:
+                results.append((False, str(e)))
+            except Exception as e:
+                results.append((False, f"An error occurred: {str(e)}"))
+
+        if valid:
+            try:
+                self.data_manager.add_actual_paystubs(valid)
+            except Exception as e:
+                return [(False, f"An error occurred: {str(e)}") for paystub_data in paystubs]
+        return results
+
+    def get_computed_paystub(self, week_end):
+        """Get the calculated paystub for a week
+
+        The stored paystub is used when there is one, since it was
+        calculated with the rules in force at the time. Otherwise the
+        paystub is calculated from the week's timesheet without saving it.
+        Returns None when neither exists.
+        """
+        paystub = self.data_manager.get_paystub(week_end)
+        if paystub:
+            return paystub
+        timesheet = self.data_manager.get_parsed_timesheet(week_end)
+        if not timesheet:
+            return None
+        employee = self.data_manager.employee
+        key = self.cache.key(employee, timesheet)
+        paystub = self.cache.get(key)
+        if paystub is None:
+            paystub = calculate_paystub(timesheet, employee, self.data_manager.deduction_plan)
+            self.cache.put(key, paystub)
+        return paystub
+
+    def get_paystub_layout(self, week_end):
+        """Get the line names of a week's paystub, for entering an actual one
+
+        Lines come from the calculated paystub for the week, or from the
+        wage categories and the employee's deduction rules when it can't
+        be calculated, plus any lines of an actual paystub already entered.
+        Returns: (bool, dict of section -> list of line names, or error
+                 message)
+        """
+        try:
+            try:
+                computed = self.get_computed_paystub(week_end)
+            except ValueError:
+                computed = None
+
+            sources = []
+            if computed:
+                sources.append(computed)
+            elif self.data_manager.employee:
+                names = [name for terms in self.data_manager.deduction_plan for name, kind, value in terms]
+                pre_tax_deductions, post_tax_deductions, additions = split_deductions(dict.fromkeys(names, 0))
+                sources.append({
+                    'hours': dict.fromkeys(WAGE_CATEGORIES),
+                    'wages': dict.fromkeys(WAGE_CATEGORIES),
+                    'pay': dict.fromkeys(['gross', 'adjusted_gross', 'net']),
+                    'pre_tax_deductions': pre_tax_deductions,
+                    'post_tax_deductions': post_tax_deductions,
+                    'additions': additions
+                })
+            actual = self.data_manager.get_actual_paystub(week_end)
+            if actual:
+                sources += [actual, actual.get('ytd') or {}]
+
+            layout = {section: [] for section in SECTIONS}
+            for source in sources:
+                for section in SECTIONS:
+                    for name in source.get(section) or {}:
+                        if name not in layout[section]:
+                            layout[section].append(name)
+            return True, layout
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
+    def _compare(self, actual, tolerances):
+        """Compare one actual paystub with its calculated paystub"""
+        week_end = actual['week_end']
+        try:
+            computed = self.get_computed_paystub(week_end)
+        except ValueError as e:
+            return {'week_end': week_end, 'status': 'error', 'message': str(e), 'lines': []}
+        if computed is None:
+            return {
+                'week_end': week_end,
+                'status': 'missing',
+                'message': "No paystub or timesheet for this week",
+                'lines': []
+            }
+
+        lines = compare_paystubs(computed, actual, tolerances)
+        note = ""
+        if actual.get('ytd'):
+            # Year to date totals come from stored paystubs only
+            if self.data_manager.get_paystub(week_end):
+                ytd_lines = compare_paystubs(self.data_manager.get_ytd(week_end), actual['ytd'], tolerances)
+                for line in ytd_lines:
+                    line['section'] = f"ytd_{line['section']}"
+                lines += ytd_lines
+            else:
+                note = " (year to date not checked until the paystub is generated)"
+
+        mismatches = find_mismatches(lines)
+        return {
+            'week_end': week_end,
+            'status': 'mismatch' if mismatches else 'match',
+            'message': (f"{len(mismatches)} line(s) differ" if mismatches else "All lines match") + note,
+            'lines': lines
+        }
+
+    def compare_paystub(self, week_end, tolerances=None):
+        """Compare the actual paystub for a week with the calculated one"""
+        try:
+            actual = self.data_manager.get_actual_paystub(week_end)
+            if not actual:
+                return False, "Actual paystub not found."
+            return True, self._compare(actual, tolerances)
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
+    def compare_paystubs(self, date_from=None, date_to=None, tolerances=None):
+        """Compare every actual paystub in a week end date range
+
+        Returns: (bool, list of comparison reports in week order, or
+                 error message)
+        """
+        try:
+            actuals = self.data_manager.get_actual_paystubs(date_from, date_to)
+            return True, [self._compare(actual, tolerances) for actual in actuals]
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
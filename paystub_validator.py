@@ -0,0 +1,480 @@
+""" Headless command line interface
+
+Runs batch jobs against the stored timesheets and paystubs without the GUI:
+
+    python -m paystub_validator batch generate --from 2025-01-01 --to 2025-03-31
+    python -m paystub_validator batch validate
+    python -m paystub_validator batch export --format csv --output paystubs.csv
+    python -m paystub_validator employees import E100
+    python -m paystub_validator employees add E200 --file employee.json
+    python -m paystub_validator import-actual stubs.json
+    python -m paystub_validator --all-employees import-punches punches.csv
+    python -m paystub_validator archive build --to 2024-12-31
+    python -m paystub_validator --all-employees archive summary --from 2015-01-01
+    python -m paystub_validator --all-employees compare --from 2024-01-01 --to 2024-12-31
+
+Only the storage layer, the operations classes and the calculators are
+loaded, and each command imports what it needs when it runs, so the tool
+starts quickly and never needs tkinter or a display.
+"""
+import argparse
+import os
+import sys
+
+# Differences in pay totals below half a cent are rounding noise
+PAY_TOLERANCE = 0.005
+
+EXPORT_FIELDS = ['week_end', 'employee_id', 'hours', 'gross', 'adjusted_gross', 'net']
+
+COMPARE_FIELDS = ['employee_id', 'week_end', 'section', 'name', 'computed', 'actual', 'difference']
+
+def parse_date(value):
+    """argparse type for YYYY-MM-DD dates"""
+    from datetime import datetime
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}'. Use YYYY-MM-DD")
+    return value
+
+def open_stores(args):
+    """Open the DataManagers selected by the command line options
+
+    Returns a list of (employee id, DataManager) pairs: every employee in
+    the multi-employee directory with --all-employees, otherwise one.
+    """
+    if args.all_employees or args.employee:
+        from data.employee_directory import EmployeeDirectory
+        directory = EmployeeDirectory(args.data_dir, args.storage)
+        employee_ids = directory.employee_ids() if args.all_employees else [args.employee]
+        return [(employee_id, directory.get_shard(employee_id)) for employee_id in employee_ids]
+    from data.storage import open_data_manager
+    return [('', open_data_manager(args.storage, args.data_dir))]
+
+def paystub_operations(data_manager, args):
+    """Create PaystubOperations that share one paystub cache for the run
+
+    The cache holds --cache-size paystubs. Its keys include the employee,
+    so the employees of --all-employees can share it.
+    """
+    from paystub_operations import PaystubOperations
+    if getattr(args, 'paystub_cache', None) is None:
+        from paystub_cache import PaystubCache
+        args.paystub_cache = PaystubCache(args.cache_size)
+    return PaystubOperations(data_manager, args.paystub_cache)
+
+def report_cache_stats(args):
+    """Print the paystub cache counters when --cache-stats is given"""
+    cache = getattr(args, 'paystub_cache', None)
+    if not args.cache_stats or cache is None:
+        return
+    stats = cache.stats()
+    print(f"Paystub cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+          f"hit rate {stats['hit_rate']:.0%}, {stats['size']} of {stats['max_size']} paystub(s) cached")
+
+def batch_generate(data_manager, args):
+    """Generate paystubs for every timesheet in the range"""
+    employee = data_manager.employee
+    timesheets = data_manager.get_parsed_timesheets(args.date_from, args.date_to)
+    results = paystub_operations(data_manager, args).generate_paystubs(
+        [(employee, timesheet) for timesheet in timesheets],
+        args.workers, args.chunksize, args.engine
+    )
+
+    failures = 0
+    for success, message in results:
+        if not success:
+            failures += 1
+            print(f"Error: {message}", file=sys.stderr)
+    print(f"Generated {len(results) - failures} of {len(results)} paystub(s)")
+    return 1 if failures else 0
+
+def batch_validate(data_manager, args):
+    """Check timesheets and recalculate their paystubs to find problems"""
+    from timesheet_operations import TimesheetOperations
+    from record_types import to_dict
+
+    timesheet_ops = TimesheetOperations(data_manager)
+    paystub_ops = paystub_operations(data_manager, args)
+
+    checked = 0
+    problems = 0
+    for timesheet in data_manager.get_parsed_timesheets(args.date_from, args.date_to):
+        week_end = timesheet.week_end
+        checked += 1
+
+        try:
+            timesheet_ops.validate_timesheet_data(to_dict(timesheet))
+        except ValueError as e:
+            problems += 1
+            print(f"{week_end}: invalid timesheet: {e}")
+            continue
+
+        stored = data_manager.get_paystub(week_end)
+        if not stored:
+            problems += 1
+            print(f"{week_end}: no paystub")
+            continue
+
+        success, expected = paystub_ops.preview_paystub(timesheet)
+        if not success:
+            problems += 1
+            print(f"{week_end}: {expected}")
+            continue
+
+        for field in ['gross', 'adjusted_gross', 'net']:
+            if abs(stored['pay'][field] - expected['pay'][field]) >= PAY_TOLERANCE:
+                problems += 1
+                print(f"{week_end}: {field} is {stored['pay'][field]:.2f}, "
+                      f"expected {expected['pay'][field]:.2f}")
+                break
+
+    print(f"Checked {checked} week(s), {problems} problem(s) found")
+    return 1 if problems else 0
+
+def export_row(paystub):
+    """Flatten a paystub into one export row"""
+    return {
+        'week_end': paystub['week_end'],
+        'employee_id': paystub.get('employee_id', ''),
+        'hours': round(sum(paystub['hours'].values()), 2),
+        'gross': paystub['pay']['gross'],
+        'adjusted_gross': paystub['pay']['adjusted_gross'],
+        'net': paystub['pay']['net']
+    }
+
+def batch_export(data_manager, args):
+    """Write the paystubs in the range as JSON or CSV"""
+    paystubs = data_manager.get_paystubs(args.date_from, args.date_to)
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            import csv
+            writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for paystub in paystubs:
+                writer.writerow(export_row(paystub))
+        else:
+            import json
+            json.dump(paystubs, output, indent=4)
+            output.write('\n')
+    finally:
+        if args.output:
+            output.close()
+
+    if args.output:
+        print(f"Exported {len(paystubs)} paystub(s) to {args.output}")
+    return 0
+
+BATCH_ACTIONS = {
+    'generate': batch_generate,
+    'validate': batch_validate,
+    'export': batch_export
+}
+
+def run_batch(stores, args):
+    """Run one of the batch actions"""
+    status = 0
+    for employee_id, data_manager in stores:
+        status = max(status, BATCH_ACTIONS[args.action](data_manager, args))
+    return status
+
+def import_actual(stores, args):
+    """Load employer-issued paystubs from a JSON file"""
+    import json
+
+    try:
+        with open(args.file, 'r') as f:
+            paystubs = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read {args.file}: {e}", file=sys.stderr)
+        return 2
+    if isinstance(paystubs, dict):
+        paystubs = [paystubs]
+
+    employee_id, data_manager = stores[0]
+    results = paystub_operations(data_manager, args).import_actual_paystubs(paystubs)
+    failures = 0
+    for success, message in results:
+        if not success:
+            failures += 1
+            print(f"Error: {message}", file=sys.stderr)
+    print(f"Imported {len(results) - failures} of {len(results)} actual paystub(s)")
+    return 1 if failures else 0
+
+def import_punches(stores, args):
+    """Build timesheets from a time-clock export"""
+    from punch_import import PunchImporter, read_punches
+
+    shards = dict(stores)
+    employee_id, data_manager = stores[0]
+    expected_id = employee_id or (data_manager.employee or {}).get('employee_id')
+
+    def store_for(row_employee_id):
+        if args.all_employees:
+            if not row_employee_id:
+                raise ValueError("Employee ID is required")
+            if row_employee_id not in shards:
+                raise ValueError(f"Unknown employee '{row_employee_id}'")
+            return shards[row_employee_id]
+        if row_employee_id and expected_id and row_employee_id != expected_id:
+            raise ValueError(f"Row is for employee '{row_employee_id}', not '{expected_id}'")
+        return data_manager
+
+    def report_error(line_number, message):
+        location = f"line {line_number}" if line_number else "import"
+        print(f"Error: {location}: {message}", file=sys.stderr)
+
+    importer = PunchImporter(store_for, args.batch_size, on_error=report_error)
+    try:
+        stats = importer.run(read_punches(args.file, args.format))
+    except OSError as e:
+        print(f"Error: could not read {args.file}: {e}", file=sys.stderr)
+        return 2
+
+    print(f"Imported {stats['imported']} of {stats['rows']} row(s) into "
+          f"{stats['timesheets']} timesheet(s) in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:.0f} rows/sec), {stats['rejected']} rejected")
+    return 1 if stats['rejected'] else 0
+
+def compare(stores, args):
+    """Compare actual paystubs with calculated ones across employees"""
+    tolerances = {}
+    if args.tolerance is not None:
+        tolerances = {section: args.tolerance for section in
+                      ['wages', 'pay', 'pre_tax_deductions', 'post_tax_deductions', 'additions']}
+    if args.hours_tolerance is not None:
+        tolerances['hours'] = args.hours_tolerance
+
+    rows = []
+    weeks = 0
+    problems = 0
+    for employee_id, data_manager in stores:
+        success, reports = paystub_operations(data_manager, args).compare_paystubs(
+            args.date_from, args.date_to, tolerances
+        )
+        if not success:
+            print(f"Error: {reports}", file=sys.stderr)
+            return 2
+
+        label = f"{employee_id} " if employee_id else ""
+        for report in reports:
+            weeks += 1
+            if report['status'] == 'match':
+                continue
+            problems += 1
+            if args.format == 'text':
+                print(f"{label}{report['week_end']}: {report['message']}")
+            for line in report['lines']:
+                if line['matches']:
+                    continue
+                rows.append(dict(
+                    {field: line[field] for field in COMPARE_FIELDS[2:]},
+                    employee_id=employee_id, week_end=report['week_end']
+                ))
+                if args.format == 'text':
+                    name = f"YTD {line['name']}" if line['section'].startswith('ytd_') else line['name']
+                    print(f"    {name}: calculated {line['computed']:.2f}, "
+                          f"actual {line['actual']:.2f} ({line['difference']:+.2f})")
+
+    if args.format == 'csv':
+        import csv
+        writer = csv.DictWriter(sys.stdout, fieldnames=COMPARE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print(f"Compared {weeks} paystub(s), {problems} with differences")
+    return 1 if problems else 0
+
+def archive(stores, args):
+    """Build the binary paystub archive or summarize it"""
+    import time
+
+    status = 0
+    for employee_id, data_manager in stores:
+        label = f"{employee_id}: " if employee_id else ""
+        if args.action == 'build':
+            if args.date_from:
+                print("Error: the archive always starts with the first paystub, --from is not used",
+                      file=sys.stderr)
+                return 2
+            count = data_manager.archive_paystubs(args.date_to)
+            print(f"{label}Archived {count} paystub(s) to {data_manager.archive_file}")
+            continue
+
+        try:
+            paystub_archive = data_manager.open_archive()
+        except (OSError, ValueError) as e:
+            print(f"Error: {label}could not open the archive: {e}", file=sys.stderr)
+            status = 2
+            continue
+        with paystub_archive:
+            started = time.perf_counter()
+            totals = paystub_archive.totals(args.date_from, args.date_to)
+            elapsed = time.perf_counter() - started
+        print(f"{label}{totals['weeks']} week(s), "
+              f"{sum(totals['hours'].values()):.2f} hours, "
+              f"gross {totals['pay'].get('gross', 0):.2f}, "
+              f"adjusted gross {totals['pay'].get('adjusted_gross', 0):.2f}, "
+              f"net {totals['pay'].get('net', 0):.2f} "
+              f"(scanned in {elapsed * 1000:.1f} ms)")
+    return status
+
+def employees(stores, args):
+    """List, add or import the employees of the multi-employee directory"""
+    import json
+    from data.employee_directory import EmployeeDirectory
+
+    directory = EmployeeDirectory(args.data_dir, args.storage)
+    try:
+        if args.action == 'list':
+            for employee_id in directory.employee_ids():
+                employee = directory.get_employee(employee_id) or {}
+                name = f"{employee.get('first_name', '')} {employee.get('last_name', '')}".strip()
+                print(f"{employee_id}\t{name}")
+            return 0
+
+        if not args.employee_id:
+            print(f"Error: employees {args.action} needs an employee id", file=sys.stderr)
+            return 2
+
+        if args.action == 'add':
+            if not args.file:
+                print("Error: employees add needs --file with the employee record", file=sys.stderr)
+                return 2
+            try:
+                with open(args.file, 'r') as f:
+                    employee = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error: could not read {args.file}: {e}", file=sys.stderr)
+                return 2
+            # Accept the {"Employee": {...}} layout of employees.json too
+            if isinstance(employee, dict) and isinstance(employee.get('Employee'), dict):
+                employee = employee['Employee']
+            if not isinstance(employee, dict):
+                print(f"Error: {args.file} does not hold an employee record", file=sys.stderr)
+                return 2
+            directory.add_employee(args.employee_id, employee)
+            print(f"Saved employee {args.employee_id}")
+            return 0
+
+        # Copy the single-employee data into a new shard
+        from data.storage import open_data_manager
+        source = open_data_manager(args.source_storage or args.storage, args.source_dir or args.data_dir)
+        try:
+            shard = directory.import_data_manager(args.employee_id, source)
+        finally:
+            source.close()
+        print(f"Imported {len(shard.week_index('timesheets'))} timesheet(s), "
+              f"{len(shard.week_index('paystubs'))} paystub(s) and "
+              f"{len(shard.week_index('actual_paystubs'))} actual paystub(s) as employee {args.employee_id}")
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Error: could not save employee {args.employee_id}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        directory.close()
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog='paystub_validator',
+        description="Headless batch jobs for PayStub Validator"
+    )
+    from data.storage import STORAGE_MODES
+
+    parser.add_argument('--data-dir', default='data', help="data directory (default: data)")
+    parser.add_argument('--storage', choices=list(STORAGE_MODES),
+                        help="storage mode (default: $PAYSTUB_STORAGE or json)")
+    parser.add_argument('--employee', help="employee id in the multi-employee directory")
+    parser.add_argument('--all-employees', action='store_true',
+                        help="run for every employee in the multi-employee directory")
+    # argparse also converts a string default, so a bad environment value
+    # is reported like a bad option
+    parser.add_argument('--cache-size', type=int, default=os.environ.get('PAYSTUB_CACHE_SIZE'),
+                        help="calculated paystubs kept in memory (default: $PAYSTUB_CACHE_SIZE or 1024)")
+    parser.add_argument('--cache-stats', action='store_true',
+                        help="print the paystub cache hits and misses when done")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help="generate, validate or export paystubs")
+    batch.add_argument('action', choices=sorted(BATCH_ACTIONS))
+    batch.add_argument('--from', dest='date_from', type=parse_date, help="first week end date")
+    batch.add_argument('--to', dest='date_to', type=parse_date, help="last week end date")
+    batch.add_argument('--workers', type=int, help="worker processes for generate")
+    batch.add_argument('--chunksize', type=int, default=64, help="items per worker task")
+    batch.add_argument('--engine', choices=['scalar', 'vectorized'], default='scalar',
+                       help="calculation engine for generate")
+    batch.add_argument('--format', choices=['json', 'csv'], default='json', help="export format")
+    batch.add_argument('--output', help="export file (default: standard output)")
+    batch.set_defaults(handler=run_batch)
+
+    actual = commands.add_parser('import-actual', help="load employer-issued paystubs from JSON")
+    actual.add_argument('file', help="JSON file holding one actual paystub or a list of them")
+    actual.set_defaults(handler=import_actual)
+
+    punches = commands.add_parser('import-punches', help="build timesheets from time-clock punches")
+    punches.add_argument('file', help="CSV or JSON Lines file of punches")
+    punches.add_argument('--format', choices=['csv', 'jsonl'],
+                         help="file format (default: from the file extension)")
+    punches.add_argument('--batch-size', type=int, default=500, help="weeks saved per batch")
+    punches.set_defaults(handler=import_punches)
+
+    archived = commands.add_parser('archive', help="pack paystubs into the binary archive or summarize it")
+    archived.add_argument('action', choices=['build', 'summary'])
+    archived.add_argument('--from', dest='date_from', type=parse_date, help="first week end date (summary)")
+    archived.add_argument('--to', dest='date_to', type=parse_date, help="last week end date")
+    archived.set_defaults(handler=archive)
+
+    comparison = commands.add_parser('compare', help="compare actual paystubs with calculated ones")
+    comparison.add_argument('--from', dest='date_from', type=parse_date, help="first week end date")
+    comparison.add_argument('--to', dest='date_to', type=parse_date, help="last week end date")
+    comparison.add_argument('--tolerance', type=float, help="largest accepted difference in dollars")
+    comparison.add_argument('--hours-tolerance', type=float, help="largest accepted difference in hours")
+    comparison.add_argument('--format', choices=['text', 'csv'], default='text', help="report format")
+    comparison.set_defaults(handler=compare)
+
+    directory = commands.add_parser('employees', help="list, add or import employees of the multi-employee directory")
+    directory.add_argument('action', choices=['list', 'add', 'import'])
+    directory.add_argument('employee_id', nargs='?', help="employee id (add and import)")
+    directory.add_argument('--file', help="JSON employee record (add)")
+    directory.add_argument('--source-dir', help="single-employee data directory to import (default: --data-dir)")
+    directory.add_argument('--source-storage', choices=list(STORAGE_MODES),
+                           help="storage mode of the imported data (default: --storage)")
+    directory.set_defaults(handler=employees)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.all_employees and (args.command == 'import-actual' or getattr(args, 'action', None) == 'export'):
+        parser.error("this command needs a single employee, use --employee")
+    if args.command == 'employees':
+        if args.all_employees or args.employee:
+            parser.error("the employees command takes the employee id as an argument")
+        # The command opens the directory itself
+        return args.handler([], args)
+    try:
+        stores = open_stores(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if not stores:
+        print("Error: the multi-employee directory has no employees, add them with "
+              "'employees add' or 'employees import'", file=sys.stderr)
+        return 2
+
+    try:
+        status = args.handler(stores, args)
+        report_cache_stats(args)
+        return status
+    finally:
+        for employee_id, data_manager in stores:
+            data_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+""" Streaming import of time-clock punches into timesheets
+
+Time-clock exports are read one row at a time from CSV or JSON Lines
+files. Each row is one punch pair for a day:
+
+    employee_id,date,time_in,time_out,is_holiday,vacation_hours,sick_hours
+    E100,2025-03-18,8:00,17:00,false,0,0
+
+Only date, time_in and time_out are required. Rows are grouped into
+weeks by date and into the Monday..Sunday entries of a timesheet. Several
+rows for the same day are merged: the day runs from the earliest time in
+to the latest time out, and vacation and sick hours are added up. A
+timesheet day holds a single shift, so a punch pair that leaves a gap
+before or after the day's other punches (a split shift or an unpaid
+break) is rejected rather than counting the gap as worked time. Days in
+the file replace the same days of an existing timesheet, other days are
+kept.
+
+Only a bounded number of weeks is held in memory. When more weeks than
+the batch size are open they are validated and saved with one
+add_timesheets call per employee, and a later row for a saved week
+reopens it from storage. Which days came from the file is only tracked
+while a week is open, so a reopened week's days are replaced again by
+its later rows; keep the rows of a day together, as time-clock exports
+do. Bad rows are reported and skipped; they never stop the import.
+"""
+import copy
+import csv
+import json
+import time
+from datetime import datetime, timedelta
+from time_parsing import parse_clock_minutes, is_valid_clock
+from timesheet_operations import TimesheetOperations
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Stored week end dates fall on a Saturday
+WEEK_END_DAY = 5
+
+# Open weeks held before they are saved
+DEFAULT_BATCH_SIZE = 500
+
+TRUE_VALUES = {'true', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'no', 'n', '0', ''}
+
+def read_punches(path, file_format=None):
+    """Yield (line number, row) pairs from a CSV or JSON Lines file
+
+    CSV rows are dicts keyed by the header. JSON Lines rows are yielded as
+    text and decoded by parse_punch, so a bad line is rejected like any
+    other bad row instead of ending the file.
+    """
+    if file_format is None:
+        file_format = 'jsonl' if str(path).endswith(('.jsonl', '.ndjson')) else 'csv'
+
+    with open(path, 'r', newline='') as f:
+        if file_format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+
+def week_end_for(date, week_end_day=WEEK_END_DAY):
+    """Get the week end date of the week holding a date"""
+    return date + timedelta(days=(week_end_day - date.weekday()) % 7)
+
+def empty_entry():
+    """Get a timesheet entry for a day without punches"""
+    return {
+        'time_in': '',
+        'time_out': '',
+        'is_holiday': False,
+        'vacation_hours': '0',
+        'sick_hours': '0'
+    }
+
+def _text(row, field):
+    value = row.get(field)
+    return '' if value is None else str(value).strip()
+
+def _parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    text = '' if value is None else str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid holiday flag '{value}'")
+
+def _parse_hours(row, field):
+    text = _text(row, field) or '0'
+    try:
+        hours = float(text)
+    except ValueError:
+        raise ValueError(f"Invalid {field.replace('_', ' ')} '{text}'")
+    if hours < 0:
+        raise ValueError(f"Negative {field.replace('_', ' ')}")
+    return hours
+
+def _format_hours(hours):
+    return f"{hours:g}"
+
+def parse_punch(row, week_end_day=WEEK_END_DAY):
+    """Check one punch row and get (employee id, week end, day, entry)
+
+    Raises ValueError describing the first problem with the row.
+    """
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError("Row is not an object")
+
+    date_text = _text(row, 'date')
+    if not date_text:
+        raise ValueError("Date is required")
+    try:
+        date = datetime.strptime(date_text, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date '{date_text}'. Use YYYY-MM-DD")
+
+    time_in = _text(row, 'time_in')
+    time_out = _text(row, 'time_out')
+    if bool(time_in) != bool(time_out):
+        raise ValueError("Time in and time out must be given together")
+    for value, label in [(time_in, 'time in'), (time_out, 'time out')]:
+        if value and not is_valid_clock(value):
+            raise ValueError(f"Invalid {label} '{value}'. Use HH:MM")
+    if time_in and parse_clock_minutes(time_out) < parse_clock_minutes(time_in):
+        raise ValueError("Time out is before time in")
+
+    entry = {
+        'time_in': time_in,
+        'time_out': time_out,
+        'is_holiday': _parse_flag(row.get('is_holiday')),
+        'vacation_hours': _format_hours(_parse_hours(row, 'vacation_hours')),
+        'sick_hours': _format_hours(_parse_hours(row, 'sick_hours'))
+    }
+    week_end = week_end_for(date, week_end_day).strftime("%Y-%m-%d")
+    return _text(row, 'employee_id'), week_end, DAYS[date.weekday()], entry
+
+def merge_entry(entry, punch):
+    """Merge another punch for the same day into a timesheet entry
+
+    Raises ValueError, leaving the entry unchanged, when the punch pair
+    neither overlaps nor touches the day's time in to time out.
+    """
+    if punch['time_in'] and entry['time_in']:
+        punch_in = parse_clock_minutes(punch['time_in'])
+        punch_out = parse_clock_minutes(punch['time_out'])
+        entry_in = parse_clock_minutes(entry['time_in'])
+        entry_out = parse_clock_minutes(entry['time_out'])
+        if punch_in > entry_out or punch_out < entry_in:
+            raise ValueError(
+                f"Punch {punch['time_in']}-{punch['time_out']} leaves a break in the shift "
+                f"{entry['time_in']}-{entry['time_out']}; a timesheet day holds one shift"
+            )
+        if punch_in < entry_in:
+            entry['time_in'] = punch['time_in']
+        if punch_out > entry_out:
+            entry['time_out'] = punch['time_out']
+    elif punch['time_in']:
+        entry['time_in'] = punch['time_in']
+        entry['time_out'] = punch['time_out']
+    entry['is_holiday'] = entry['is_holiday'] or punch['is_holiday']
+    for field in ['vacation_hours', 'sick_hours']:
+        entry[field] = _format_hours(float(entry[field]) + float(punch[field]))
+
+class PunchImporter:
+    """Build timesheets from a stream of punch rows and save them in batches
+
+    store_for(employee_id) returns the DataManager a row's timesheet is
+    saved to, or raises ValueError to reject the row (e.g. for an unknown
+    employee).
+    """
+    def __init__(self, store_for, batch_size=DEFAULT_BATCH_SIZE, week_end_day=WEEK_END_DAY, on_error=None):
+        self.store_for = store_for
+        self.batch_size = max(1, batch_size)
+        self.week_end_day = week_end_day
+        self.on_error = on_error
+        self.timesheet_ops = TimesheetOperations(None)
+        # (employee id, week end) -> unsaved week: its DataManager, the
+        # timesheet, the days imported into it (merged rather than
+        # replaced) and the number of rows it holds
+        self.open_weeks = {}
+        self.stats = {'rows': 0, 'imported': 0, 'rejected': 0, 'timesheets': 0, 'batches': 0}
+
+    def _reject(self, line_number, message):
+        self.stats['rejected'] += 1
+        if self.on_error:
+            self.on_error(line_number, message)
+
+    def _open_week(self, employee_id, week_end):
+        """Get the unsaved week, starting from the stored timesheet"""
+        key = (employee_id, week_end)
+        if key not in self.open_weeks:
+            store = self.store_for(employee_id)
+            if len(self.open_weeks) >= self.batch_size:
+                self.flush()
+            stored = store.get_timesheet(week_end)
+            if stored:
+                timesheet = copy.deepcopy(stored)
+                # Keep the usual day order whatever the stored order was
+                timesheet['entries'] = {
+                    day: timesheet['entries'].get(day, empty_entry()) for day in DAYS
+                }
+            else:
+                timesheet = {'week_end': week_end, 'entries': {day: empty_entry() for day in DAYS}}
+            self.open_weeks[key] = {'store': store, 'timesheet': timesheet, 'days': set(), 'rows': 0}
+        return self.open_weeks[key]
+
+    def add_row(self, line_number, row):
+        """Add one punch row, rejecting it if it is invalid"""
+        self.stats['rows'] += 1
+        try:
+            employee_id, week_end, day, punch = parse_punch(row, self.week_end_day)
+            week = self._open_week(employee_id, week_end)
+        except ValueError as e:
+            self._reject(line_number, str(e))
+            return
+
+        entries = week['timesheet']['entries']
+        if day in week['days']:
+            try:
+                merge_entry(entries[day], punch)
+            except ValueError as e:
+                self._reject(line_number, str(e))
+                return
+        else:
+            entries[day] = punch
+            week['days'].add(day)
+        week['rows'] += 1
+
+    def flush(self):
+        """Validate the open weeks and save them, one call per employee
+
+        Rows are counted as imported once their week is saved.
+        """
+        by_store = {}
+        for (employee_id, week_end), week in self.open_weeks.items():
+            try:
+                self.timesheet_ops.validate_timesheet_data(week['timesheet'])
+            except ValueError as e:
+                self._reject(None, f"Week {week_end}: {e}")
+                continue
+            by_store.setdefault(id(week['store']), (week['store'], []))[1].append(week)
+
+        for store, weeks in by_store.values():
+            try:
+                store.add_timesheets([week['timesheet'] for week in weeks])
+            except Exception as e:
+                self._reject(None, f"Could not save {len(weeks)} timesheet(s): {e}")
+                continue
+            self.stats['timesheets'] += len(weeks)
+            self.stats['imported'] += sum(week['rows'] for week in weeks)
+        if self.open_weeks:
+            self.stats['batches'] += 1
+        self.open_weeks = {}
+
+    def run(self, rows):
+        """Import (line number, row) pairs and save everything
+
+        Returns: dict of counts plus elapsed seconds and rows per second
+        """
+        started = time.perf_counter()
+        for line_number, row in rows:
+            self.add_row(line_number, row)
+        self.flush()
+
+        elapsed = time.perf_counter() - started
+        self.stats['seconds'] = elapsed
+        self.stats['rows_per_second'] = self.stats['rows'] / elapsed if elapsed > 0 else 0.0
+        return self.stats
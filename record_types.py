@@ -0,0 +1,210 @@
+""" Compact record types for timesheets, day entries and paystubs
+
+Stored records are nested dicts of strings and floats. These classes use
+__slots__ and hold the values the calculators need already parsed: clock
+times as minutes since midnight, leave hours as floats and paystub lines
+as float arrays whose names are shared between records. from_dict() and
+to_dict() convert losslessly to and from the stored JSON shape.
+
+The storage modes that keep records in memory hold timesheets as
+Timesheet records, parsed once when they are loaded or saved, and the
+hours and paystub calculators work on them directly. PaystubCache keeps
+calculated paystubs as Paystub records.
+
+Values that fail to parse are kept as they were stored; the calculators
+parse them again at use to raise the usual error for that value.
+"""
+import copy
+from array import array
+from time_parsing import parse_clock_minutes
+
+class _Missing:
+    """Marks a field that was absent from the stored record"""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Unpickles as this module's MISSING, so identity checks still
+        # work on records sent to worker processes
+        return 'MISSING'
+
+MISSING = _Missing()
+
+ENTRY_FIELDS = ('time_in', 'time_out', 'is_holiday', 'vacation_hours', 'sick_hours')
+
+PAYSTUB_SECTIONS = ('hours', 'wages', 'pay', 'pre_tax_deductions', 'post_tax_deductions', 'additions')
+
+# Day and line name tuples shared by every record that uses them
+_shared_names = {}
+
+def _share(names):
+    return _shared_names.setdefault(names, names)
+
+def _parse(parser, value):
+    try:
+        return parser(value)
+    except (TypeError, ValueError):
+        return None
+
+def _raw(data, field):
+    return data[field] if field in data else MISSING
+
+class TimesheetEntry:
+    """One day of a timesheet with parsed clock times and leave hours"""
+    __slots__ = (
+        'time_in', 'time_out', 'is_holiday', 'vacation_text', 'sick_text',
+        'minutes_in', 'minutes_out', 'vacation_hours', 'sick_hours', 'extra'
+    )
+
+    @classmethod
+    def from_dict(cls, data):
+        entry = cls()
+        entry.time_in = _raw(data, 'time_in')
+        entry.time_out = _raw(data, 'time_out')
+        entry.is_holiday = _raw(data, 'is_holiday')
+        entry.vacation_text = _raw(data, 'vacation_hours')
+        entry.sick_text = _raw(data, 'sick_hours')
+        entry.minutes_in = _parse(parse_clock_minutes, entry.time_in) if entry.time_in else None
+        entry.minutes_out = _parse(parse_clock_minutes, entry.time_out) if entry.time_out else None
+        entry.vacation_hours = _parse(float, data.get('vacation_hours', '0'))
+        entry.sick_hours = _parse(float, data.get('sick_hours', '0'))
+        extra = {key: value for key, value in data.items() if key not in ENTRY_FIELDS}
+        entry.extra = copy.deepcopy(extra) if extra else None
+        return entry
+
+    def to_dict(self):
+        data = {}
+        for field, value in zip(ENTRY_FIELDS, (
+            self.time_in, self.time_out, self.is_holiday, self.vacation_text, self.sick_text
+        )):
+            if value is not MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(copy.deepcopy(self.extra))
+        return data
+
+    def holiday(self):
+        """Check whether the day is a holiday; a missing flag means it is not"""
+        return self.is_holiday is not MISSING and bool(self.is_holiday)
+
+    def is_worked(self):
+        """Check whether the day has both a time in and a time out"""
+        return (self.time_in is not MISSING and self.time_out is not MISSING
+                and bool(self.time_in) and bool(self.time_out))
+
+    def clock_minutes(self):
+        """Get (time in, time out) in minutes since midnight
+
+        Raises ValueError for an invalid time, like parse_clock_minutes.
+        """
+        minutes_in = self.minutes_in
+        if minutes_in is None:
+            minutes_in = parse_clock_minutes(self.time_in)
+        minutes_out = self.minutes_out
+        if minutes_out is None:
+            minutes_out = parse_clock_minutes(self.time_out)
+        return minutes_in, minutes_out
+
+    def leave_hours(self):
+        """Get (vacation hours, sick hours), raising ValueError if invalid"""
+        vacation = self.vacation_hours
+        if vacation is None:
+            vacation = float(self.vacation_text)
+        sick = self.sick_hours
+        if sick is None:
+            sick = float(self.sick_text)
+        return vacation, sick
+
+class Timesheet:
+    """A week of parsed day entries in timesheet order"""
+    __slots__ = ('week_end', 'days', 'entries', 'extra')
+
+    def __init__(self, week_end, days=(), entries=(), extra=None):
+        self.week_end = week_end
+        self.days = days
+        self.entries = entries
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {key: value for key, value in data.items() if key not in ('week_end', 'entries')}
+        return cls(
+            data['week_end'],
+            _share(tuple(data['entries'])),
+            tuple(TimesheetEntry.from_dict(entry) for entry in data['entries'].values()),
+            copy.deepcopy(extra) if extra else None
+        )
+
+    def to_dict(self):
+        data = {
+            'week_end': self.week_end,
+            'entries': {day: entry.to_dict() for day, entry in zip(self.days, self.entries)}
+        }
+        if self.extra:
+            data.update(copy.deepcopy(self.extra))
+        return data
+
+    def count_days_worked(self):
+        """Count the days with both a time in and a time out"""
+        return len([entry for entry in self.entries if entry.is_worked()])
+
+def parse_timesheet(timesheet):
+    """Get a timesheet as a Timesheet record, parsing it if it is a dict"""
+    if isinstance(timesheet, Timesheet):
+        return timesheet
+    return Timesheet.from_dict(timesheet)
+
+def to_dict(record):
+    """Get a record in its stored dict shape, whether or not it is parsed"""
+    if isinstance(record, (Timesheet, Paystub)):
+        return record.to_dict()
+    return record
+
+def json_default(record):
+    """json.dump default= hook that writes records in their stored shape"""
+    if isinstance(record, (Timesheet, Paystub)):
+        return record.to_dict()
+    raise TypeError(f"Object of type {type(record).__name__} is not JSON serializable")
+
+class Paystub:
+    """A paystub whose sections are float arrays with shared line names
+
+    A section that is not all floats (an entered actual paystub, say) is
+    kept as the dict it was stored as.
+    """
+    __slots__ = PAYSTUB_SECTIONS + ('week_end', 'extra')
+
+    @classmethod
+    def from_dict(cls, data):
+        paystub = cls()
+        paystub.week_end = _raw(data, 'week_end')
+        for section in PAYSTUB_SECTIONS:
+            amounts = data.get(section, MISSING)
+            if isinstance(amounts, dict) and all(type(value) is float for value in amounts.values()):
+                amounts = (_share(tuple(amounts)), array('d', amounts.values()))
+            elif amounts is not MISSING:
+                amounts = copy.deepcopy(amounts)
+            setattr(paystub, section, amounts)
+        extra = {key: value for key, value in data.items()
+                 if key != 'week_end' and key not in PAYSTUB_SECTIONS}
+        paystub.extra = copy.deepcopy(extra) if extra else None
+        return paystub
+
+    def section(self, section):
+        """Get one section as a new dict"""
+        amounts = getattr(self, section)
+        if isinstance(amounts, tuple):
+            return dict(zip(*amounts))
+        if amounts is MISSING:
+            return None
+        return copy.deepcopy(amounts)
+
+    def to_dict(self):
+        data = {}
+        if self.week_end is not MISSING:
+            data['week_end'] = self.week_end
+        for section in PAYSTUB_SECTIONS:
+            if getattr(self, section) is not MISSING:
+                data[section] = self.section(section)
+        if self.extra:
+            data.update(copy.deepcopy(self.extra))
+        return data
@@ -0,0 +1,77 @@
+import random
+import unittest
+from paystub_operations import calculate_paystubs, calculate_paystubs_in_parallel
+from record_types import parse_timesheet
+from tests.test_money import make_employee, make_timesheet
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def make_items(count):
+    """Build a seeded batch of timesheets plus items that fail or overflow"""
+    rng = random.Random(1)
+    employees = [make_employee(), make_employee()]
+    employees[1]['pay_rate'] = '31.17'
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+    items = []
+    for i in range(count):
+        timesheet = make_timesheet(f"2024-01-{i % 28 + 1:02d}", {})
+        for day in days:
+            if rng.random() < 0.2:
+                continue
+            start = rng.randint(0, 20)
+            end = min(23, start + rng.randint(1, 12))
+            timesheet['entries'][day].update({
+                'time_in': f"{start}:{rng.choice([0, 7, 15, 30, 45]):02d}",
+                'time_out': f"{end}:{rng.choice([0, 10, 50]):02d}",
+                'is_holiday': rng.random() < 0.1,
+                'vacation_hours': rng.choice(['0', '2', '7.5']),
+                'sick_hours': rng.choice(['0', '0', '3.25'])
+            })
+        items.append((rng.choice(employees), timesheet))
+
+    # A rate too large for int64 arithmetic takes the scalar fallback
+    overflow = make_employee()
+    overflow['pay_rate'] = '1000000000000'
+    items.append((overflow, items[0][1]))
+    items.append((None, items[1][1]))
+    bad_time = make_timesheet('2024-02-03', {'Monday': ('bad', '1:00')})
+    items.append((employees[0], bad_time))
+    return items
+
+class EngineParityTest(unittest.TestCase):
+    """The scalar, vectorized and parallel engines give identical results"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.items = make_items(200)
+        cls.expected = calculate_paystubs(cls.items)
+
+    def test_error_items(self):
+        self.assertIsNotNone(self.expected[-3][0])
+        self.assertEqual(self.expected[-2], (None, "Employee not found."))
+        self.assertEqual(self.expected[-1][0], None)
+        self.assertIn("does not match format '%H:%M'", self.expected[-1][1])
+
+    def test_parsed_timesheets(self):
+        items = [(employee, parse_timesheet(timesheet)) for employee, timesheet in self.items]
+        self.assertEqual(calculate_paystubs(items), self.expected)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_vectorized(self):
+        from calculate_vectorized import calculate_paystubs_vectorized
+        self.assertEqual(calculate_paystubs_vectorized(self.items), self.expected)
+
+    def test_parallel(self):
+        self.assertEqual(calculate_paystubs_in_parallel(self.items, 2, 50), self.expected)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_parallel_vectorized(self):
+        results = calculate_paystubs_in_parallel(self.items, 2, 50, 'vectorized')
+        self.assertEqual(results, self.expected)
+
+if __name__ == '__main__':
+    unittest.main()
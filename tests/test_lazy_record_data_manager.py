@@ -0,0 +1,45 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from data.lazy_record_data_manager import LazyRecordDataManager
+
+def make_timesheet(week_end, time_out='17:00'):
+    entry = {'time_in': '08:00', 'time_out': time_out, 'is_holiday': False,
+             'vacation_hours': '0', 'sick_hours': '0'}
+    return {'week_end': week_end, 'entries': {'Monday': entry}}
+
+WEEKS = [f"2020-{month:02d}-{day:02d}" for month in (1, 2) for day in (4, 11, 18, 25)] + ['2020-03-07', '2020-03-14']
+
+class LazyBatchWriteTest(unittest.TestCase):
+    """Batches larger than the record cache are saved in full"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self):
+        return LazyRecordDataManager(self.data_dir, 'E1', cache_size=4)
+
+    def test_new_records_are_written(self):
+        self.open().add_timesheets([make_timesheet(week_end) for week_end in WEEKS])
+
+        reopened = self.open()
+        self.assertEqual([timesheet['week_end'] for timesheet in reopened.get_timesheets()], WEEKS)
+        self.assertEqual(len(list((self.data_dir / 'timesheets').glob('*.json'))), len(WEEKS))
+
+    def test_updated_records_are_written(self):
+        data_manager = self.open()
+        data_manager.add_timesheets([make_timesheet(week_end) for week_end in WEEKS])
+        data_manager.add_timesheets([make_timesheet(week_end, '18:00') for week_end in WEEKS])
+
+        for record_file in (self.data_dir / 'timesheets').glob('*.json'):
+            with open(record_file) as f:
+                self.assertEqual(json.load(f)['entries']['Monday']['time_out'], '18:00')
+        self.assertEqual(self.open().get_timesheet(WEEKS[0])['entries']['Monday']['time_out'], '18:00')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from calculate_paystub import calculate_paystub
+from calculate_wages import calculate_wages
+from money import apply_rate, rate_fraction, round_div, to_cents
+
+def make_employee():
+    def term(name, category, kind, amount=0.0, rate=None):
+        term = {'name': name, 'category': category, 'type': kind, 'amount': amount}
+        if rate is not None:
+            term['rate'] = rate
+        return term
+
+    return {
+        'pay_rate': '23.6438',
+        'union': {
+            'additions': [
+                term('LONGEVT', 'pre-tax', 'fixed', 3.0),
+                term('MEALS N', 'pre-tax', 'per-day', 2.0),
+                term('TRAVELN', 'pre-tax', 'per-day', 0.5)
+            ],
+            'deductions': [
+                term('UNION N', 'pre-tax', 'percentage', rate=0.0188),
+                term('UN INST', 'pre-tax', 'fixed', 25.0)
+            ]
+        },
+        'special_deductions': [
+            term('401K% T', 'pre-tax', 'percentage', rate=0.06),
+            term('AFLCNTT', 'pre-tax', 'fixed', 48.33),
+            term('WILTONN', 'pre-tax', 'fixed', 23.84)
+        ],
+        'payroll_deductions': [
+            term('FEDERAL', 'post-tax', 'percentage', rate=0.0612),
+            term('STATE', 'post-tax', 'percentage', rate=0.0419),
+            term('FICA', 'post-tax', 'percentage', rate=0.0692),
+            term('MEDICARE', 'post-tax', 'percentage', rate=0.0162),
+            term('NYPFL N', 'post-tax', 'percentage', rate=0.0047),
+            term('DIS-SUI', 'post-tax', 'fixed', 0.6)
+        ]
+    }
+
+def make_timesheet(week_end, shifts):
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    entries = {}
+    for day in days:
+        time_in, time_out = shifts.get(day, ('', ''))
+        entries[day] = {'time_in': time_in, 'time_out': time_out, 'is_holiday': False,
+                        'vacation_hours': '0', 'sick_hours': '0'}
+    return {'week_end': week_end, 'entries': entries}
+
+SAMPLE_SHIFTS = {
+    'Tuesday': ('8:00', '17:00'),
+    'Wednesday': ('8:00', '20:00'),
+    'Thursday': ('8:00', '17:00'),
+    'Friday': ('8:00', '17:00'),
+    'Saturday': ('10:00', '11:50')
+}
+
+class RoundingTest(unittest.TestCase):
+    """Amounts are rounded half up to the cent, once per line item"""
+
+    def test_round_div_rounds_halves_up(self):
+        self.assertEqual(round_div(5, 2), 3)
+        self.assertEqual(round_div(5, 4), 1)
+        self.assertEqual(round_div(7, 4), 2)
+        self.assertEqual(round_div(-5, 2), -2)
+
+    def test_rate_fraction_drops_float_noise(self):
+        self.assertEqual(rate_fraction(0.018799999999999997), (47, 2500))
+        self.assertEqual(rate_fraction(0.0188), (47, 2500))
+        self.assertEqual(rate_fraction('23.6438'), (118219, 5000))
+        self.assertEqual(rate_fraction('0.123456785'), (12345679, 100000000))
+
+    def test_to_cents_rounds_halves_up(self):
+        self.assertEqual(to_cents(0.125), 13)
+        self.assertEqual(to_cents(2.675), 268)
+        self.assertEqual(to_cents(1.004), 100)
+
+    def test_apply_rate_rounds_halves_up(self):
+        self.assertEqual(apply_rate(1005, (1, 2)), 503)
+        self.assertEqual(apply_rate(1003, (1, 2)), 502)
+        self.assertEqual(apply_rate(100486, rate_fraction(0.0188)), 1889)
+
+    def test_wages_round_each_line(self):
+        hours = {'Regular': 1.0, 'Regular OT': 1.0, 'Holiday': 0.0, 'Holiday OT': 0.0,
+                 'Vacation': 0.0, 'Sick': 0.0, 'Differential': 0.0}
+        self.assertEqual(calculate_wages(hours, '10.005')['Regular'], 10.01)
+        self.assertEqual(calculate_wages(hours, '31.17')['Regular OT'], 46.76)
+
+    def test_paystub_totals_are_sums_of_rounded_lines(self):
+        paystub = calculate_paystub(make_timesheet('2025-03-22', SAMPLE_SHIFTS), make_employee())
+
+        # 886.6425 and 118.219 round to the cent before they are added
+        self.assertEqual(paystub['wages']['Regular'], 886.64)
+        self.assertEqual(paystub['wages']['Regular OT'], 118.22)
+        self.assertEqual(paystub['pay'], {'gross': 1004.86, 'adjusted_gross': 828.51, 'net': 683.36})
+        self.assertEqual(paystub['pre_tax_deductions'],
+                         {'UNION N': 18.89, 'UN INST': 25.0, '401K% T': 60.29,
+                          'AFLCNTT': 48.33, 'WILTONN': 23.84})
+        self.assertEqual(paystub['post_tax_deductions'],
+                         {'FEDERAL': 50.7, 'STATE': 34.71, 'FICA': 57.33,
+                          'MEDICARE': 13.42, 'NYPFL N': 3.89, 'DIS-SUI': 0.6})
+        self.assertEqual(paystub['additions'], {'LONGEVT': 3.0, 'MEALS N': 10.0, 'TRAVELN': 2.5})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from calculate_hours import calculate_weekly_hours
+from data.data_manager import DataManager
+from punch_import import PunchImporter
+
+def punch(date, time_in, time_out):
+    return {'employee_id': '', 'date': date, 'time_in': time_in, 'time_out': time_out}
+
+class SplitShiftTest(unittest.TestCase):
+    """Several punch pairs for one day never count a break as worked"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager = DataManager(self.temp_dir.name)
+        self.errors = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_import(self, rows):
+        importer = PunchImporter(lambda employee_id: self.data_manager,
+                                 on_error=lambda line_number, message: self.errors.append(line_number))
+        stats = importer.run(enumerate(rows, 2))
+        return stats, self.data_manager.get_timesheet('2025-03-22')
+
+    def test_split_shift_is_rejected(self):
+        stats, timesheet = self.run_import([
+            punch('2025-03-18', '09:00', '12:00'),
+            punch('2025-03-18', '13:00', '18:00')
+        ])
+
+        self.assertEqual(self.errors, [3])
+        self.assertEqual((stats['imported'], stats['rejected']), (1, 1))
+        tuesday = timesheet['entries']['Tuesday']
+        self.assertEqual((tuesday['time_in'], tuesday['time_out']), ('09:00', '12:00'))
+        self.assertEqual(calculate_weekly_hours(timesheet)['Regular'], 3.0)
+
+    def test_touching_and_overlapping_pairs_are_merged(self):
+        stats, timesheet = self.run_import([
+            punch('2025-03-18', '09:00', '12:00'),
+            punch('2025-03-18', '12:00', '15:00'),
+            punch('2025-03-18', '14:00', '17:00'),
+            punch('2025-03-18', '08:00', '10:00')
+        ])
+
+        self.assertEqual(self.errors, [])
+        self.assertEqual(stats['imported'], 4)
+        tuesday = timesheet['entries']['Tuesday']
+        self.assertEqual((tuesday['time_in'], tuesday['time_out']), ('08:00', '17:00'))
+        self.assertEqual(calculate_weekly_hours(timesheet)['Regular'], 9.0)
+
+if __name__ == '__main__':
+    unittest.main()
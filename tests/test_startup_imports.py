@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules only the other storage modes, the archive and the YTD index need
+OTHER_BACKENDS = [
+    'sqlite3', 'mmap', 'data.record_data_manager', 'data.lazy_record_data_manager',
+    'data.journal_data_manager', 'data.sqlite_data_manager', 'data.paystub_archive', 'data.ytd_index'
+]
+
+class StartupImportTest(unittest.TestCase):
+    """Opening the GUI's data store loads only the selected storage backend"""
+
+    def test_json_mode_loads_no_other_backend(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            script = (
+                "import sys, main\n"
+                f"main.open_data_manager('json', {data_dir!r})\n"
+                f"print(','.join(name for name in {OTHER_BACKENDS!r} if name in sys.modules))\n"
+            )
+            result = subprocess.run([sys.executable, '-c', script], cwd=ROOT,
+                                    capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+""" Fast clock time parsing
+
+Timesheets store clock times as "H:MM" or "HH:MM" strings. Every valid
+value is precomputed into a lookup table mapping the string to minutes
+since midnight, so parsing is a dict lookup. datetime.strptime is only
+used as a fallback for unusual spellings and to produce its usual error
+message for invalid times.
+"""
+from datetime import datetime
+
+def _build_clock_table():
+    """Map every valid H:MM and HH:MM string to minutes since midnight"""
+    table = {}
+    for hour in range(24):
+        for minute in range(60):
+            minutes = hour * 60 + minute
+            table[f"{hour}:{minute:02d}"] = minutes
+            table[f"{hour:02d}:{minute:02d}"] = minutes
+    return table
+
+CLOCK_MINUTES = _build_clock_table()
+SECONDS = {f"{second:02d}": second for second in range(60)}
+
+def parse_clock_minutes(time_text):
+    """Convert an H:MM or HH:MM time to minutes since midnight
+
+    Raises ValueError for invalid times.
+    """
+    try:
+        return CLOCK_MINUTES[time_text]
+    except (KeyError, TypeError):
+        parsed = datetime.strptime(time_text, "%H:%M")
+        return parsed.hour * 60 + parsed.minute
+
+def parse_clock_seconds(time_text):
+    """Convert an HH:MM:SS time to seconds since midnight
+
+    Raises ValueError for invalid times.
+    """
+    if time_text[-3:-2] == ':':
+        minutes = CLOCK_MINUTES.get(time_text[:-3])
+        second = SECONDS.get(time_text[-2:])
+        if minutes is not None and second is not None:
+            return minutes * 60 + second
+    parsed = datetime.strptime(time_text, "%H:%M:%S")
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+def is_valid_clock(time_text):
+    """Check whether a string is a valid H:MM or HH:MM time"""
+    try:
+        parse_clock_minutes(time_text)
+        return True
+    except (ValueError, TypeError):
+        return False
@@ -1,4 +1,5 @@
 from datetime import datetime
+from time_parsing import is_valid_clock
 
 class TimesheetOperations:
     def __init__(self, data_manager):
@@ -20,6 +21,10 @@ class TimesheetOperations:
         for day, entry in timesheet_data['entries'].items():
             if not all(key in entry for key in ['time_in', 'time_out']):
                 raise ValueError(f"Missing required fields for {day}")
+
+            for field, label in [('time_in', 'time in'), ('time_out', 'time out')]:
+                if entry[field] and not is_valid_clock(entry[field]):
+                    raise ValueError(f"Invalid {label} for {day}. Use HH:MM")
             
             if not isinstance(entry.get('is_holiday', False), bool):
                 raise ValueError(f"Invalid holiday format for {day}")
@@ -51,6 +56,16 @@ class TimesheetOperations:
         except Exception as e:
             return None
 
+    def get_timesheet_details(self, week_end):
+        """Get timesheet details"""
+        try:
+            timesheet = self.data_manager.get_timesheet(week_end)
+            if not timesheet:
+                return False, "Timesheet not found."
+            return True, timesheet
+        except Exception as e:
+            return False, f"An error occurred: {str(e)}"
+
     def delete_timesheet(self, week_end):
         """Delete a timesheet"""
         try: